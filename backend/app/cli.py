@@ -0,0 +1,92 @@
+import argparse
+from datetime import date
+from app.database import Base, engine, get_db
+from app.migrations.runner import run_migrations
+from app.repositories.spending_rollup_repository import rebuild_monthly_spendings
+from app.utils.init import full_dump
+from app.utils.synthetic_data import generate_dataset
+
+
+def rebuild_rollups(args):
+    db = next(get_db())
+    try:
+        rebuild_monthly_spendings(db)
+        print("Monthly spending rollup rebuilt.")
+    finally:
+        db.close()
+
+
+def migrate(args):
+    if engine is None:
+        raise RuntimeError("Database connection is not available.")
+    # Creates missing tables on a fresh database; existing ones are left to the migrations
+    Base.metadata.create_all(bind=engine)
+    applied = run_migrations(engine)
+    print(f"Applied migrations: {applied}" if applied else "Database is up to date.")
+
+
+def seed(args):
+    db = next(get_db())
+    try:
+        if full_dump(db):
+            print("Seed data is in place.")
+        else:
+            print("Demo accounts already exist, nothing was seeded.")
+    finally:
+        db.close()
+
+
+def generate(args):
+    db = next(get_db())
+    try:
+        generate_dataset(
+            db,
+            teams=args.teams,
+            users_per_team=args.users_per_team,
+            expenses_per_user=args.expenses_per_user,
+            seed=args.seed,
+            start=args.start,
+            months=args.months,
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild = commands.add_parser(
+        "rebuild-rollups", help="Recompute the monthly spending rollup from expenses"
+    )
+    rebuild.set_defaults(handler=rebuild_rollups)
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="Apply pending schema migrations (indexes are built CONCURRENTLY)"
+    )
+    migrate_parser.set_defaults(handler=migrate)
+
+    seed_parser = commands.add_parser(
+        "seed", help="Insert demo categories, accounts, teams and expenses into a development database"
+    )
+    seed_parser.set_defaults(handler=seed)
+
+    generate_parser = commands.add_parser(
+        "generate", help="Bulk load a deterministic synthetic dataset for load and performance testing"
+    )
+    generate_parser.add_argument("--teams", type=int, default=10)
+    generate_parser.add_argument("--users-per-team", type=int, default=10, help="Including the team's manager")
+    generate_parser.add_argument("--expenses-per-user", type=int, default=1000)
+    generate_parser.add_argument("--seed", type=int, default=0, help="Same seed, same dataset; must be unused")
+    generate_parser.add_argument("--start", type=date.fromisoformat, default=date(2023, 1, 1), help="First month, YYYY-MM-DD")
+    generate_parser.add_argument("--months", type=int, default=24)
+    generate_parser.add_argument("--batch-size", type=int, default=100_000, help="Expenses per COPY")
+    generate_parser.set_defaults(handler=generate)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,57 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+def _flag(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
 class Settings:
     SECRET_KEY = os.getenv("SECRET_KEY")
     DATABASE_URL = os.getenv("DATABASE_URL")
+    # Defaults to DATABASE_URL with the asyncpg driver
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL")
+    # Per engine; a worker holds up to POOL_SIZE + MAX_OVERFLOW connections per engine
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", 5))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", 10))
+    DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", 30))
+    DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", 1800))
+    DATABASE_POOL_PRE_PING = _flag("DATABASE_POOL_PRE_PING", "true")
+    # Optional hot standby for read-only routes; the async URL defaults to it with asyncpg
+    DATABASE_REPLICA_URL = os.getenv("DATABASE_REPLICA_URL")
+    ASYNC_DATABASE_REPLICA_URL = os.getenv("ASYNC_DATABASE_REPLICA_URL")
+    # Seconds after a user's last write during which their reads stay on the primary
+    DATABASE_REPLICA_STICKINESS = float(os.getenv("DATABASE_REPLICA_STICKINESS", 10))
+    # Set when connecting through PgBouncer in transaction pooling mode
+    DATABASE_TRANSACTION_POOLING = _flag("DATABASE_TRANSACTION_POOLING")
+    # Milliseconds, 0 disables it
+    DATABASE_STATEMENT_TIMEOUT = int(os.getenv("DATABASE_STATEMENT_TIMEOUT", 0))
     TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+    # bcrypt cost for new hashes; older hashes are upgraded on login
+    PASSWORD_HASH_ROUNDS = int(os.getenv("PASSWORD_HASH_ROUNDS", 12))
+    # Processes hashing passwords for the API, and how many jobs may wait for them
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 64))
+    # Seconds an authenticated user is served from the in-process cache, 0 disables it
+    PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", 30))
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    # off, warn or error: what to do when one request runs the same statement
+    # shape more than QUERY_REPEAT_LIMIT times (an N+1 query)
+    QUERY_REPEAT_CHECK = os.getenv("QUERY_REPEAT_CHECK", "off").lower()
+    QUERY_REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", 10))
+    # Statements slower than this many milliseconds are written to
+    # SLOW_QUERY_LOG_FILE as JSON lines, 0 disables the log
+    SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 0))
+    SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "slow_queries.log")
+    # Share of slow SELECTs re-run under EXPLAIN (ANALYZE, BUFFERS) for their plan
+    SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SLOW_QUERY_EXPLAIN_RATE", 0.1))
+    # Bearer token Prometheus must send to /metrics; unset leaves it open
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN")
     ALGORITHM = os.getenv("ALGORITHM")
+    EXPENSES_PAGE_SIZE = int(os.getenv("EXPENSES_PAGE_SIZE", 100))
+    EXPENSES_MAX_PAGE_SIZE = int(os.getenv("EXPENSES_MAX_PAGE_SIZE", 1000))
+    TEAMS_PAGE_SIZE = int(os.getenv("TEAMS_PAGE_SIZE", 50))
+    TEAMS_MAX_PAGE_SIZE = int(os.getenv("TEAMS_MAX_PAGE_SIZE", 500))
+    USERS_PAGE_SIZE = int(os.getenv("USERS_PAGE_SIZE", 50))
+    USERS_MAX_PAGE_SIZE = int(os.getenv("USERS_MAX_PAGE_SIZE", 500))
 
 
 settings = Settings()
\ No newline at end of file
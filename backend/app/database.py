@@ -1,27 +1,109 @@
-from sqlalchemy import create_engine, text
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from sqlalchemy import create_engine, event, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
-from sqlalchemy.exc import OperationalError
 from app.core.config import settings
+from app.utils.pool_stats import TimedAsyncQueuePool, TimedQueuePool
+# Registers the slow query log's listeners for every engine, API and CLI alike
+from app.utils import slow_query_log
 
 DATABASE = settings.DATABASE_URL
 
 engine = None
 SessionLocal = None 
+async_engine = None
+AsyncSessionLocal = None
+replica_engine = None
+ReplicaSessionLocal = None
+async_replica_engine = None
+AsyncReplicaSessionLocal = None
 Base = declarative_base()
 
-try:
-    print("Connecting to the database...", DATABASE)
-    engine = create_engine(DATABASE)
+
+def _engine_options(poolclass, connect_args: dict) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def _sync_connect_args() -> dict:
+    if settings.DATABASE_STATEMENT_TIMEOUT and not settings.DATABASE_TRANSACTION_POOLING:
+        return {"options": f"-c statement_timeout={settings.DATABASE_STATEMENT_TIMEOUT}"}
+    return {}
+
+
+def _async_connect_args() -> dict:
+    if settings.DATABASE_TRANSACTION_POOLING:
+        # PgBouncer hands each transaction a different server connection, so
+        # neither asyncpg's statement cache nor the SQLAlchemy dialect's own
+        # prepared statement cache may reuse a statement prepared earlier.
+        # With both off no state outlives a transaction, which is why the
+        # app-side pool (of connections to PgBouncer, not to Postgres) stays
+        # instead of the NullPool SQLAlchemy suggests: it saves a handshake
+        # per checkout and keeps the pool metrics and timeouts.
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    if settings.DATABASE_STATEMENT_TIMEOUT:
+        return {"server_settings": {"statement_timeout": str(settings.DATABASE_STATEMENT_TIMEOUT)}}
+    return {}
+
+
+def _async_url(url: str, override: str = None):
+    return override or make_url(url).set(drivername="postgresql+asyncpg")
+
+
+def _set_local_statement_timeout(connection):
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {settings.DATABASE_STATEMENT_TIMEOUT}")
+
+
+def _configure_statement_timeout(engine):
+    # PgBouncer in transaction mode rejects startup options and would leak a
+    # session SET to other clients, so the timeout is set per transaction instead
+    if settings.DATABASE_STATEMENT_TIMEOUT and settings.DATABASE_TRANSACTION_POOLING:
+        event.listen(engine, "begin", _set_local_statement_timeout)
+
+
+# Engines connect lazily: importing the app opens no connection, and the
+# lifespan hook in main.py checks that the database is reachable.
+if DATABASE:
+    engine = create_engine(DATABASE, **_engine_options(TimedQueuePool, _sync_connect_args()))
+    _configure_statement_timeout(engine)
     SessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=engine)
 
-    with engine.connect() as connection:
-        connection.execute(text('SELECT 1'))
-    print("Database connection successful.")
+    # The API's hot paths run on asyncpg so a worker is not limited by its
+    # threadpool; scripts and tests keep using the sync engine above.
+    async_engine = create_async_engine(
+        _async_url(DATABASE, settings.ASYNC_DATABASE_URL),
+        **_engine_options(TimedAsyncQueuePool, _async_connect_args()),
+    )
+    _configure_statement_timeout(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    if settings.DATABASE_REPLICA_URL:
+        replica_engine = create_engine(
+            settings.DATABASE_REPLICA_URL, **_engine_options(TimedQueuePool, _sync_connect_args())
+        )
+        _configure_statement_timeout(replica_engine)
+        ReplicaSessionLocal = sessionmaker(autoflush=False, autocommit=False, bind=replica_engine)
+        async_replica_engine = create_async_engine(
+            _async_url(settings.DATABASE_REPLICA_URL, settings.ASYNC_DATABASE_REPLICA_URL),
+            **_engine_options(TimedAsyncQueuePool, _async_connect_args()),
+        )
+        _configure_statement_timeout(async_replica_engine.sync_engine)
+        AsyncReplicaSessionLocal = async_sessionmaker(
+            async_replica_engine, autoflush=False, expire_on_commit=False
+        )
 
-except OperationalError as e:
-    print("Could not connect to the database. Exception: ", e)
-    engine = None
-    SessionLocal = None
 
 def get_db():
     if SessionLocal is None:
@@ -31,4 +113,45 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        raise RuntimeError("Database connection is not available.")
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Picks the session factory for a read-only request. Reads go to the replica,
+# except for a user who wrote within DATABASE_REPLICA_STICKINESS seconds, who
+# stays on the primary so they see their own writes despite replication lag.
+def read_session_factory(data_changed_at: datetime = None, asynchronous: bool = False):
+    primary, replica = (
+        (AsyncSessionLocal, AsyncReplicaSessionLocal)
+        if asynchronous
+        else (SessionLocal, ReplicaSessionLocal)
+    )
+    if replica is None:
+        return primary
+    window = timedelta(seconds=settings.DATABASE_REPLICA_STICKINESS)
+    if data_changed_at is not None and datetime.now(timezone.utc) - data_changed_at < window:
+        return primary
+    return replica
+
+
+# The configured engines by role, async ones as their underlying sync Engine
+# (which owns the pool), for pool monitoring
+def pool_engines() -> dict:
+    engines = {
+        "sync": engine,
+        "async": async_engine,
+        "replica": replica_engine,
+        "async_replica": async_replica_engine,
+    }
+    return {
+        name: getattr(bound, "sync_engine", bound)
+        for name, bound in engines.items()
+        if bound is not None
+    }
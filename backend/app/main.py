@@ -1,16 +1,35 @@
-from fastapi import Depends, FastAPI
-from sqlalchemy.orm import Session
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base, get_db
-from app.routers import expenses_router, auth_router, user_router, team_router, category_router
-from app.utils.init import full_dump
+from fastapi.responses import ORJSONResponse
+from app.database import async_engine, async_replica_engine
+from app.routers import expenses_router, auth_router, user_router, team_router, category_router, monitoring_router, metrics_router
+from app.migrations.runner import pending_migrations
+from app.utils.password_hasher import password_hasher
+from app.utils.metrics import MetricsMiddleware
+from app.utils.query_stats import QueryStatsMiddleware
 
-app = FastAPI()
-if engine is not None:
-    Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Startup only checks that the database answers and the schema is current;
+    # migrations and seed data are applied with `python -m app.cli migrate` / `seed`
+    if async_engine is None:
+        raise RuntimeError("DATABASE_URL is not set")
+    async with async_engine.connect() as connection:
+        await connection.execute(text("SELECT 1"))
+        pending = await connection.run_sync(pending_migrations)
+    if pending:
+        print(f"Pending migrations {pending}; run `python -m app.cli migrate`")
+    yield
+    # asyncpg connections belong to the event loop that opened them
+    for pool_engine in (async_engine, async_replica_engine):
+        if pool_engine is not None:
+            await pool_engine.dispose()
+    password_hasher.shutdown()
 
-db = next(get_db())
-full_dump(db)
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 
 origins = [
@@ -27,7 +46,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Prev-Cursor", "ETag", "Server-Timing"],
 )
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 app.include_router(expenses_router.router, prefix="/api", tags=["expenses"])
@@ -35,3 +57,5 @@ app.include_router(auth_router.router, tags=["auth"])
 app.include_router(user_router.router, prefix="/api", tags=["users"])
 app.include_router(team_router.router, prefix="/api", tags=["team"])
 app.include_router(category_router.router, prefix="/api", tags=["categories"])
+app.include_router(monitoring_router.router, prefix="/api", tags=["monitoring"])
+app.include_router(metrics_router.router, tags=["monitoring"])
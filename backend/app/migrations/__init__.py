@@ -0,0 +1,18 @@
+from app.migrations import (
+    m0001_expense_indexes,
+    m0002_backfill_monthly_spendings,
+    m0003_trigram_search_indexes,
+    m0004_user_data_version,
+    m0005_user_data_changed_at,
+    m0006_catalog_version,
+)
+
+# Applied in order; never renumber or edit a migration that has shipped
+MIGRATIONS = [
+    m0001_expense_indexes,
+    m0002_backfill_monthly_spendings,
+    m0003_trigram_search_indexes,
+    m0004_user_data_version,
+    m0005_user_data_changed_at,
+    m0006_catalog_version,
+]
@@ -0,0 +1,24 @@
+from sqlalchemy.engine import Connection
+from app.migrations.operations import create_index_concurrently
+
+VERSION = 1
+DESCRIPTION = "Indexes for expense, statistics and team hot paths"
+TRANSACTIONAL = False
+
+# Kept in sync with the Index declarations in app/models.py
+INDEXES = [
+    # Expense list and keyset pagination, rolling-window statistics
+    ("ix_expenses_user_id_date_id", "expenses", "user_id, date, id"),
+    # Per-category statistics and category-filtered lists
+    ("ix_expenses_user_id_category_id_date", "expenses", "user_id, category_id, date"),
+    # Category reassignment on delete and admin expense counts
+    ("ix_expenses_category_id", "expenses", "category_id"),
+    ("ix_users_team_id", "users", "team_id"),
+    ("ix_teams_manager_id", "teams", "manager_id"),
+    ("ix_monthly_spendings_category_id", "monthly_spendings", "category_id"),
+]
+
+
+def upgrade(connection: Connection):
+    for name, table, columns in INDEXES:
+        create_index_concurrently(connection, name, table, columns)
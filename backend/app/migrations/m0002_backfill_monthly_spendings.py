@@ -0,0 +1,18 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 2
+DESCRIPTION = "Backfill the monthly spending rollup for existing expenses"
+TRANSACTIONAL = True
+
+
+def upgrade(connection: Connection):
+    connection.execute(text("LOCK TABLE expenses IN SHARE MODE"))
+    connection.execute(text("DELETE FROM monthly_spendings"))
+    connection.execute(
+        text(
+            "INSERT INTO monthly_spendings (user_id, category_id, month, total, count)"
+            " SELECT user_id, category_id, date_trunc('month', date)::date, sum(amount), count(id)"
+            " FROM expenses GROUP BY 1, 2, 3"
+        )
+    )
@@ -0,0 +1,28 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from app.migrations.operations import create_index_concurrently
+
+VERSION = 3
+DESCRIPTION = "Trigram indexes for substring search on expenses and users"
+TRANSACTIONAL = False
+
+# Not declared in app/models.py: gin_trgm_ops only exists once pg_trgm is installed
+INDEXES = [
+    ("ix_expenses_name_trgm", "expenses", "name gin_trgm_ops"),
+    ("ix_users_name_trgm", "users", "name gin_trgm_ops"),
+    ("ix_users_surname_trgm", "users", "surname gin_trgm_ops"),
+    ("ix_users_email_trgm", "users", "email gin_trgm_ops"),
+]
+
+
+def upgrade(connection: Connection):
+    available = connection.execute(
+        text("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+    ).first()
+    if not available:
+        print("pg_trgm is not available on this server; search falls back to sequential scans.")
+        return False
+
+    connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    for name, table, columns in INDEXES:
+        create_index_concurrently(connection, name, table, columns, using="gin")
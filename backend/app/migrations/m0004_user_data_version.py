@@ -0,0 +1,13 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 4
+DESCRIPTION = "Add the per-user data version used for conditional GETs"
+TRANSACTIONAL = True
+
+
+def upgrade(connection: Connection):
+    # A constant default is stored in the catalog, so this does not rewrite the table
+    connection.execute(
+        text("ALTER TABLE users ADD COLUMN IF NOT EXISTS data_version integer NOT NULL DEFAULT 0")
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 5
+DESCRIPTION = "Record when a user's expense data last changed, for replica stickiness"
+TRANSACTIONAL = True
+
+
+def upgrade(connection: Connection):
+    connection.execute(
+        text("ALTER TABLE users ADD COLUMN IF NOT EXISTS data_changed_at timestamptz")
+    )
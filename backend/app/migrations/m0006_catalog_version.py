@@ -0,0 +1,17 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+VERSION = 6
+DESCRIPTION = "Add the catalog version that category changes bump instead of every user's"
+TRANSACTIONAL = True
+
+
+def upgrade(connection: Connection):
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS catalog_version ("
+            " id integer PRIMARY KEY,"
+            " version integer NOT NULL DEFAULT 0)"
+        )
+    )
+    connection.execute(text("INSERT INTO catalog_version (id) VALUES (1) ON CONFLICT DO NOTHING"))
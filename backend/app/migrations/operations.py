@@ -0,0 +1,21 @@
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+
+def create_index_concurrently(
+    connection: Connection, name: str, table: str, columns: str, using: str = "btree"
+):
+    # A failed CONCURRENTLY build leaves an INVALID index behind that
+    # IF NOT EXISTS would silently keep, so drop it before retrying.
+    invalid = connection.execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid"
+            " WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        connection.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+    connection.execute(
+        text(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} USING {using} ({columns})")
+    )
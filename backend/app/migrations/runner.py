@@ -0,0 +1,65 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+from app.migrations import MIGRATIONS
+
+# Arbitrary key for pg_advisory_lock so concurrent workers migrate one at a time
+MIGRATION_LOCK_ID = 740_815_001
+
+
+def _applied_versions(connection: Connection) -> set[int]:
+    connection.execute(
+        text(
+            "CREATE TABLE IF NOT EXISTS schema_migrations ("
+            " version INTEGER PRIMARY KEY,"
+            " description VARCHAR(200) NOT NULL,"
+            " applied_at TIMESTAMP NOT NULL DEFAULT now())"
+        )
+    )
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def _record(connection: Connection, migration):
+    connection.execute(
+        text("INSERT INTO schema_migrations (version, description) VALUES (:version, :description)"),
+        {"version": migration.VERSION, "description": migration.DESCRIPTION},
+    )
+
+
+# Read-only check used at startup; applying migrations is left to the CLI
+def pending_migrations(connection: Connection) -> list[int]:
+    applied = set()
+    if inspect(connection).has_table("schema_migrations"):
+        applied = {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+    return [migration.VERSION for migration in MIGRATIONS if migration.VERSION not in applied]
+
+
+def run_migrations(engine: Engine) -> list[int]:
+    applied_now = []
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so the
+    # runner works in autocommit mode and opens transactions only where asked.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        # Index builds and backfills may legitimately outlive the API's statement_timeout
+        connection.execute(text("SET statement_timeout = 0"))
+        connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+        try:
+            applied = _applied_versions(connection)
+            for migration in MIGRATIONS:
+                if migration.VERSION in applied:
+                    continue
+                print(f"Applying migration {migration.VERSION}: {migration.DESCRIPTION}")
+                # An upgrade returning False is deferred and retried on the next run
+                if migration.TRANSACTIONAL:
+                    with engine.begin() as transaction:
+                        transaction.execute(text("SET LOCAL statement_timeout = 0"))
+                        if migration.upgrade(transaction) is False:
+                            continue
+                        _record(transaction, migration)
+                else:
+                    if migration.upgrade(connection) is False:
+                        continue
+                    _record(connection, migration)
+                applied_now.append(migration.VERSION)
+        finally:
+            connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            connection.execute(text("RESET statement_timeout"))
+    return applied_now
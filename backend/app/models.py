@@ -1,5 +1,6 @@
 from app.database import Base
-from sqlalchemy import Boolean, Column, Float, ForeignKey, Integer, String, Date
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Index, Integer, String, Date
+from sqlalchemy.orm import relationship
 
 
 class User(Base):
@@ -13,6 +14,14 @@ class User(Base):
     role = Column(String(50), nullable=True)  # user, manager, admin
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
     is_approved = Column(Boolean, nullable=False, default=False)
+    # Bumped on every write to the user's expenses; feeds the ETags of their reads
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Time of that last write; keeps the user's reads on the primary for a while
+    data_changed_at = Column(DateTime(timezone=True), nullable=True)
+
+    team = relationship("Team", foreign_keys=[team_id], back_populates="members")
+
+    __table_args__ = (Index("ix_users_team_id", "team_id"),)
 
 
 class Team(Base):
@@ -24,6 +33,16 @@ class Team(Base):
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True
     )
 
+    # Users and teams reference each other, so each side names the foreign key
+    # it follows. Managers are linked through manager_id only and keep team_id empty;
+    # manager is read-only, so managers are still assigned through manager_id.
+    members = relationship(
+        "User", foreign_keys=[User.team_id], back_populates="team", order_by=User.id
+    )
+    manager = relationship("User", foreign_keys=[manager_id], viewonly=True)
+
+    __table_args__ = (Index("ix_teams_manager_id", "manager_id"),)
+
 
 class Expense(Base): 
     __tablename__ = "expenses"
@@ -37,9 +56,41 @@ class Expense(Base):
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
+    # Created on live databases by app/migrations/m0001_expense_indexes.py
+    __table_args__ = (
+        Index("ix_expenses_user_id_date_id", "user_id", "date", "id"),
+        Index("ix_expenses_user_id_category_id_date", "user_id", "category_id", "date"),
+        Index("ix_expenses_category_id", "category_id"),
+    )
+
 
 class Category(Base):
     __tablename__ = "categories"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     name = Column(String(50), nullable=False, unique=True)
+
+
+class CatalogVersion(Base):
+    __tablename__ = "catalog_version"
+
+    # Single row (id 1) bumped when categories change, since their names appear
+    # in every user's expense reads; feeds the ETags of those reads
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class MonthlySpending(Base):
+    __tablename__ = "monthly_spendings"
+
+    # Rollup of expenses per user, category and calendar month, kept in sync
+    # by the expense and category repositories
+    user_id = Column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    category_id = Column(Integer, ForeignKey("categories.id"), primary_key=True)
+    month = Column(Date, primary_key=True)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (Index("ix_monthly_spendings_category_id", "category_id"),)
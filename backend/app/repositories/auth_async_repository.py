@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import User
+from app.repositories.auth_repository import create_password
+from app.repositories.user_repository import get_user_by_email
+from app.schemas.user_schema import UserRegister
+from app.utils.jwt_handler import create_access_token
+from app.utils.password_hasher import password_hasher
+
+# Async versions of the auth flows for the API: queries run on the AsyncSession
+# and bcrypt runs in password_hasher's process pool, so neither holds a thread.
+
+
+async def create_user(db: AsyncSession, user: UserRegister):
+    existing_user = await db.run_sync(get_user_by_email, user.email)
+    if existing_user:
+        raise ValueError("Email already registered")
+
+    db_user = User(
+        name=user.name,
+        surname=user.surname,
+        email=user.email,
+        password_hash=await password_hasher.hash(user.password),
+        role="user",
+    )
+    db.add(db_user)
+    await db.commit()
+
+
+async def authenticate_user(db: AsyncSession, email: str, password: str) -> dict:
+    user = await db.run_sync(get_user_by_email, email)
+    if not user:
+        raise ValueError("User not found")
+    valid, new_hash = await password_hasher.verify_and_update(password, user.password_hash)
+    if not valid:
+        raise ValueError("Incorrect password")
+    if new_hash:
+        # Stored at an outdated cost; replace it while the plain password is at hand
+        user.password_hash = new_hash
+        await db.commit()
+
+    access_token = create_access_token(data={"sub": user.email})
+    return {"access_token": access_token, "role": user.role}
+
+
+async def reset_password(db: AsyncSession, email: str) -> str:
+    user = await db.run_sync(get_user_by_email, email)
+    if not user:
+        raise ValueError("User not found")
+    password = create_password()
+    user.password_hash = await password_hasher.hash(password)
+    await db.commit()
+    return password
@@ -5,6 +5,7 @@ from app.utils.security import get_hashed_password, verify_password
 from app.utils.jwt_handler import create_access_token, decode_access_token
 from app.repositories.user_repository import get_user_by_email
 from app.models import User
+from app.utils.principal_cache import Principal, principal_cache
 import random
 import string
 
@@ -52,13 +53,21 @@ def refresh_token(db: Session, token: str) -> Optional[Token]:
     new_access_token = create_access_token(data={"sub": user.email})
     return new_access_token
 
+# Cached like get_current_user, so approval and role checks share one lookup
+def get_principal(db: Session, user_email: str) -> Optional[Principal]:
+    principal = principal_cache.get(user_email)
+    if principal is None:
+        user = get_user_by_email(db, user_email)
+        if user is None:
+            return None
+        principal = principal_cache.put(user_email, Principal.from_user(user))
+    return principal
+
 def check_user_approval(db: Session, user_email: str) -> bool:
-    user = get_user_by_email(db, user_email)
-    return user.is_approved
+    return get_principal(db, user_email).is_approved
 
 def get_user_role(db: Session, user_email: str) -> str:
-    user = get_user_by_email(db, user_email)
-    return user.role
+    return get_principal(db, user_email).role
 
 def reset_password(db: Session, email: str):
     user = get_user_by_email(db, email)
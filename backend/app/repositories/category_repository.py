@@ -1,5 +1,9 @@
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
-from app.models import Category, Expense, User
+from app.models import Category, Expense, MonthlySpending, User
+import app.repositories.spending_rollup_repository as rollup
+from app.repositories.user_repository import bump_catalog_version
+from app.utils.search import matches
 
 def get_category_by_name(db: Session, category_name: str) -> Category:
     return db.query(Category).filter(Category.name == category_name).first()
@@ -11,24 +15,25 @@ def get_categories_for_admin(
     if current_user.role != "admin":
         raise PermissionError("You are not an admin")
 
-    categories = db.query(Category)
+    # Counted from the monthly rollup in one grouped query rather than one
+    # COUNT over expenses per category
+    expense_count = func.coalesce(func.sum(MonthlySpending.count), 0).label("expense_count")
+    categories = (
+        db.query(Category.id, Category.name, expense_count)
+        .outerjoin(MonthlySpending, MonthlySpending.category_id == Category.id)
+        .group_by(Category.id, Category.name)
+    )
 
     if name:
-        categories = categories.filter(Category.name.contains(name))
-    category_info = []
-    for category in categories:
-        expense_count = (
-            db.query(Expense).filter(Expense.category_id == category.id).count()
-        )
-        category_info.append(
-            {"id": category.id, "name": category.name, "expense_count": expense_count}
-        )
-    if ascending:
-        category_info.sort(key=lambda x: x["expense_count"])
-    else:
-        category_info.sort(key=lambda x: x["expense_count"], reverse=True)
+        categories = categories.filter(matches([Category.name], name))
+    categories = categories.order_by(
+        expense_count if ascending else expense_count.desc(), Category.id
+    )
 
-    return category_info
+    return [
+        {"id": category.id, "name": category.name, "expense_count": category.expense_count}
+        for category in categories
+    ]
 
 def get_categories(db: Session, current_user: User) -> list[dict]:
     if(current_user.is_approved == False):
@@ -46,6 +51,8 @@ def create_category(db: Session, name: str, current_user: User):
         raise ValueError("Category already exists")
     category = Category(name=name)
     db.add(category)
+    # Every category is listed in the dashboard and category spendings
+    bump_catalog_version(db)
     db.commit()
     db.refresh(category)
 
@@ -63,12 +70,16 @@ def delete_category(db: Session, category_id: int, current_user: User):
     if category.name == "default":
         raise ValueError("Cannot delete default category")
 
-    expenses_with_deleted_category = (
-        db.query(Expense).filter(Expense.category_id == category_id).all()
+    # Expenses and their rollup buckets move to the default category in two
+    # set-based statements, however many expenses the category has
+    db.execute(
+        update(Expense).where(Expense.category_id == category_id).values(category_id=1),
+        execution_options={"synchronize_session": False},
     )
-    for expense in expenses_with_deleted_category:
-        expense.category_id = 1
+    rollup.move_category(db, category_id, 1)
     db.delete(category)
+    # Category names are part of every user's expense list
+    bump_catalog_version(db)
     db.commit()
 
 
@@ -88,5 +99,6 @@ def update_category(db: Session, category_id: int, name: str, current_user: User
         raise ValueError("Category already exists")
 
     category.name = name
+    bump_catalog_version(db)
     db.commit()
     db.refresh(category)
@@ -0,0 +1,75 @@
+from datetime import date
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import User
+import app.repositories.expenses_repository as repo
+from app.schemas.expense_schema import (
+    ExpenseBulkDelete,
+    ExpenseBulkUpdate,
+    ExpenseCreate,
+    ExpensePage,
+    ExpenseUpdate,
+    ExpenseView,
+)
+
+# Async entry points for the API. Each one runs the sync implementation on the
+# AsyncSession's asyncpg connection through run_sync, so the queries are shared
+# with scripts and tests while the event loop, not a worker thread, waits on I/O.
+
+
+async def get_expenses(db: AsyncSession, current_user: User, *args, **kwargs) -> ExpensePage:
+    return await db.run_sync(repo.get_expenses, current_user, *args, **kwargs)
+
+
+async def create_expense(db: AsyncSession, expense: ExpenseCreate, current_user: User):
+    return await db.run_sync(repo.create_expense, expense, current_user)
+
+
+async def update_expense(
+    db: AsyncSession, expense_id: int, expense_update: ExpenseUpdate, current_user: User
+) -> ExpenseView:
+    return await db.run_sync(repo.update_expense, expense_id, expense_update, current_user)
+
+
+async def delete_expense(db: AsyncSession, expense_id: int, current_user: User):
+    return await db.run_sync(repo.delete_expense, expense_id, current_user)
+
+
+async def bulk_update_expenses(
+    db: AsyncSession, bulk_update: ExpenseBulkUpdate, current_user: User
+) -> int:
+    return await db.run_sync(repo.bulk_update_expenses, bulk_update, current_user)
+
+
+async def bulk_delete_expenses(
+    db: AsyncSession, bulk_delete: ExpenseBulkDelete, current_user: User
+) -> int:
+    return await db.run_sync(repo.bulk_delete_expenses, bulk_delete, current_user)
+
+
+async def get_dashboard_statistics(db: AsyncSession, current_user: User) -> dict:
+    return await db.run_sync(repo.get_dashboard_statistics, current_user)
+
+
+async def get_total_spendings(db: AsyncSession, current_user: User) -> dict:
+    return await db.run_sync(repo.get_total_spendings, current_user)
+
+
+async def get_yearly_comparison(db: AsyncSession, current_user: User) -> dict:
+    return await db.run_sync(repo.get_yearly_comparison, current_user)
+
+
+async def get_category_spendings(db: AsyncSession, current_user: User) -> dict:
+    return await db.run_sync(repo.get_category_spendings, current_user)
+
+
+async def get_spending_series(
+    db: AsyncSession,
+    current_user: User,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    category_id: int = None,
+) -> list[dict]:
+    return await db.run_sync(
+        repo.get_spending_series, current_user, start_date, end_date, granularity, category_id
+    )
@@ -1,22 +1,101 @@
-from datetime import datetime, timedelta
-from sqlalchemy import func
+from datetime import date, datetime, timedelta
+from typing import BinaryIO, Iterator
+from pydantic import ValidationError
+from sqlalchemy import Date, case, cast, delete, func, insert, select, tuple_, update
 from sqlalchemy.orm import Session
-from app.models import Category, Expense, User
+from app.core.config import settings
+from app.models import Category, Expense, MonthlySpending, Team, User
+import app.repositories.spending_rollup_repository as rollup
+from app.repositories.user_repository import bump_data_version
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.search import matches
+from app.utils.expense_io import EXPORT_FORMATS, iter_rows, write_rows
+from app.utils.expense_filter import compile_filter
+from app.utils.serialization import validate_list
 from app.schemas.expense_schema import (
+    ExpenseBulkDelete,
+    ExpenseBulkUpdate,
+    ExpenseFilter,
+    ExpenseImportError,
+    ExpenseImportResult,
+    ExpenseImportRow,
     ExpenseList,
+    ExpensePage,
     ExpenseUpdate,
     ExpenseView,
     ExpenseCreate,
 )
 
 
-def get_expenses(db: Session, current_user: User, expense_name: str, expense_amount: float, expense_category: int, expense_date:datetime.date ) -> list[ExpenseList]:
+EXPENSE_SORT_COLUMNS = {
+    "date": Expense.date,
+    "amount": Expense.amount,
+    "name": Expense.name,
+    "category": Category.name,
+}
+
+
+def _cursor_value(sort_by: str, value):
+    if sort_by == "date":
+        return date.fromisoformat(value)
+    if sort_by == "amount":
+        return float(value)
+    return str(value)
+
+
+def _filter_expenses(
+    query,
+    expense_name: str,
+    expense_amount: float,
+    expense_category: int,
+    expense_date: date,
+    start_date: date = None,
+    end_date: date = None,
+    expression: dict = None,
+):
+    if expense_name:
+        query = query.filter(matches([Expense.name], expense_name))
+    if expense_amount:
+        query = query.filter(Expense.amount == expense_amount)
+    if expense_category:
+        query = query.filter(Expense.category_id == expense_category)
+    if expense_date:
+        query = query.filter(Expense.date == expense_date)
+    if start_date:
+        query = query.filter(Expense.date >= start_date)
+    if end_date:
+        query = query.filter(Expense.date <= end_date)
+    if expression:
+        query = query.filter(compile_filter(expression))
+    return query
+
+
+def get_expenses(
+    db: Session,
+    current_user: User,
+    expense_name: str,
+    expense_amount: float,
+    expense_category: int,
+    expense_date: datetime.date,
+    sort_by: str = "date",
+    sort_order: str = "desc",
+    limit: int = settings.EXPENSES_PAGE_SIZE,
+    cursor: str = None,
+    expression: dict = None,
+) -> ExpensePage:
     if current_user.role == "admin":
         raise PermissionError("Admins cannot have expenses")
 
     if current_user.is_approved == False:
         raise PermissionError("User is not approved yet")
 
+    if sort_by not in EXPENSE_SORT_COLUMNS:
+        raise ValueError("Invalid sort key")
+    if sort_order not in ("asc", "desc"):
+        raise ValueError("Invalid sort order")
+    if limit < 1 or limit > settings.EXPENSES_MAX_PAGE_SIZE:
+        raise ValueError("Invalid page size")
+
     query = (
         db.query(
             Expense.id,
@@ -29,30 +108,112 @@ def get_expenses(db: Session, current_user: User, expense_name: str, expense_amo
         .join(Category, Expense.category_id == Category.id)
         .filter(Expense.user_id == current_user.id)
     )
+    query = _filter_expenses(
+        query, expense_name, expense_amount, expense_category, expense_date, expression=expression
+    )
 
-    if expense_name:
-        query = query.filter(Expense.name.contains(expense_name))
-    if expense_amount:
-        query = query.filter(Expense.amount == expense_amount)
-    if expense_category:
-        query = query.filter(Category.id == expense_category)
-    if expense_date:
-        query = query.filter(Expense.date == expense_date)
+    # Keyset pagination on (sort column, id): the cursor stores the last row
+    # seen, so every page is an index range scan instead of an OFFSET.
+    sort_column = EXPENSE_SORT_COLUMNS[sort_by]
+    direction = "next"
+    if cursor:
+        position = decode_cursor(cursor)
+        if position["sort_by"] != sort_by or position["sort_order"] != sort_order:
+            raise ValueError("Cursor does not match the requested sorting")
+        direction = position["direction"]
+        key = tuple_(sort_column, Expense.id)
+        boundary = tuple_(_cursor_value(sort_by, position["value"]), position["id"])
+        if (sort_order == "asc") == (direction == "next"):
+            query = query.filter(key > boundary)
+        else:
+            query = query.filter(key < boundary)
+
+    ascending = (sort_order == "asc") == (direction == "next")
+    if ascending:
+        query = query.order_by(sort_column.asc(), Expense.id.asc())
+    else:
+        query = query.order_by(sort_column.desc(), Expense.id.desc())
+
+    expenses = query.limit(limit + 1).all()
+    has_more = len(expenses) > limit
+    expenses = expenses[:limit]
+    if direction == "prev":
+        expenses.reverse()
+
+    items = validate_list(ExpenseList, expenses)
+
+    def row_cursor(expense, row_direction):
+        value = expense.category_name if sort_by == "category" else getattr(expense, sort_by)
+        return encode_cursor(sort_by, sort_order, value, expense.id, row_direction)
+
+    next_cursor = None
+    prev_cursor = None
+    if expenses:
+        if direction == "prev" or has_more:
+            next_cursor = row_cursor(expenses[-1], "next")
+        if (direction == "next" and cursor) or (direction == "prev" and has_more):
+            prev_cursor = row_cursor(expenses[0], "prev")
+
+    return ExpensePage(items=items, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_expenses(
+    db: Session,
+    current_user: User,
+    file_format: str,
+    expense_name: str,
+    expense_amount: float,
+    expense_category: int,
+    expense_date: date,
+    start_date: date,
+    end_date: date,
+    team: bool = False,
+    expression: dict = None,
+) -> Iterator[str]:
+    if team:
+        if current_user.role != "manager":
+            raise PermissionError("You are not a manager")
+    elif current_user.role == "admin":
+        raise PermissionError("Admins cannot have expenses")
 
-    expenses = query.all()
+    if current_user.is_approved == False:
+        raise PermissionError("User is not approved yet")
 
+    if file_format not in EXPORT_FORMATS:
+        raise ValueError("Unsupported export format")
 
-    return [
-        ExpenseList(
-            id=expense.id,
-            name=expense.name,
-            amount=expense.amount,
-            date=expense.date,
-            category_name=expense.category_name,
-            category_id=expense.category_id,
-        )
-        for expense in expenses
+    columns = [
+        Expense.id,
+        Expense.name,
+        Expense.amount,
+        Expense.date,
+        Category.name.label("category"),
     ]
+    if team:
+        existing_team = db.query(Team).filter(Team.manager_id == current_user.id).first()
+        if not existing_team:
+            raise ValueError("No team found for the manager")
+        columns.append(User.email.label("user_email"))
+        query = (
+            db.query(*columns)
+            .join(User, User.id == Expense.user_id)
+            .filter(User.team_id == existing_team.id)
+        )
+    else:
+        query = db.query(*columns).filter(Expense.user_id == current_user.id)
+
+    query = query.join(Category, Expense.category_id == Category.id)
+    query = _filter_expenses(
+        query, expense_name, expense_amount, expense_category, expense_date, start_date, end_date, expression
+    ).order_by(Expense.date, Expense.id)
+
+    # yield_per streams through a server-side cursor, so only one batch of
+    # rows is held in memory no matter how large the export is.
+    rows = query.execution_options(yield_per=EXPORT_BATCH_SIZE)
+    return write_rows(rows, [column.key for column in columns], file_format, EXPORT_BATCH_SIZE)
 
 
 def view_expense(db: Session, expense_id: int, current_user: User) -> ExpenseView:
@@ -110,10 +271,82 @@ def create_expense(db: Session, expense: ExpenseCreate, current_user: User):
         user_id=current_user.id,
     )
     db.add(db_expense)
+    rollup.add_expense(db, db_expense)
+    bump_data_version(db, [current_user.id])
     db.commit()
     db.refresh(db_expense)
 
 
+IMPORT_BATCH_SIZE = 1000
+MAX_IMPORT_ERRORS = 1000
+
+
+def import_expenses(
+    db: Session, current_user: User, stream: BinaryIO, file_format: str
+) -> ExpenseImportResult:
+    if current_user.role == "admin":
+        raise PermissionError("Admins cannot have expenses")
+
+    if current_user.is_approved == False:
+        raise PermissionError("User is not approved yet")
+
+    # Category names are resolved against one in-memory map instead of a
+    # lookup per row; rows without a category go to the default one like create_expense.
+    categories = {name.strip().lower(): id for id, name in db.query(Category.id, Category.name)}
+    imported = 0
+    errors = []
+    failed = 0
+    batch = []
+
+    def flush():
+        if batch:
+            db.execute(insert(Expense), batch)
+            rollup.add_expense_rows(db, batch)
+            batch.clear()
+
+    for line_number, raw in iter_rows(stream, file_format):
+        error = None
+        if raw is None:
+            error = "Row is not a JSON object"
+        else:
+            try:
+                row = ExpenseImportRow.model_validate(
+                    {key: value for key, value in raw.items() if value not in ("", None)}
+                )
+                category_id = categories.get(row.category.strip().lower()) if row.category else 1
+                if category_id is None:
+                    error = "Category not found"
+            except ValidationError as e:
+                first = e.errors()[0]
+                error = f"{'.'.join(str(part) for part in first['loc'])}: {first['msg']}"
+
+        if error:
+            failed += 1
+            if len(errors) < MAX_IMPORT_ERRORS:
+                errors.append(ExpenseImportError(row=line_number, error=error))
+            continue
+
+        batch.append(
+            {
+                "name": row.name,
+                "amount": row.amount,
+                "date": row.date,
+                "category_id": category_id,
+                "user_id": current_user.id,
+            }
+        )
+        imported += 1
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            flush()
+
+    flush()
+    if imported:
+        bump_data_version(db, [current_user.id])
+    db.commit()
+
+    return ExpenseImportResult(imported=imported, failed=failed, errors=errors)
+
+
 def update_expense(
     db: Session, expense_id: int, expense_update: ExpenseUpdate, current_user: User
 ) -> ExpenseView:
@@ -126,15 +359,20 @@ def update_expense(
     if(expense_update.amount < 0):
         raise ValueError("Amount cannot be negative")
     
+    # Locked, and re-read after any wait, so concurrent writes to the same
+    # expense cannot both subtract its old values from the rollup
     db_expense = (
         db.query(Expense)
         .filter(Expense.id == expense_id, Expense.user_id == current_user.id)
+        .with_for_update()
+        .populate_existing()
         .first()
     )
 
     if not db_expense: 
         raise ValueError("Expense not found")
 
+    rollup.remove_expense(db, db_expense)
     if expense_update.name is not None:
         db_expense.name = expense_update.name
     if expense_update.amount is not None:
@@ -143,6 +381,8 @@ def update_expense(
         db_expense.date = expense_update.date
     if expense_update.category_id is not None:
         db_expense.category_id = expense_update.category_id
+    rollup.add_expense(db, db_expense)
+    bump_data_version(db, [current_user.id])
 
     db.commit()
     db.refresh(db_expense)
@@ -165,58 +405,243 @@ def delete_expense(db: Session, expense_id: int, current_user: User):
     
     if current_user.is_approved == False:
         raise PermissionError("User is not approved yet")
+    # Locked, and re-read after any wait, so concurrent writes to the same
+    # expense cannot both subtract its old values from the rollup
     db_expense = (
         db.query(Expense)
         .filter(Expense.id == expense_id, Expense.user_id == current_user.id)
+        .with_for_update()
+        .populate_existing()
         .first()
     )
 
     if not db_expense:
         raise ValueError("Expense not found")
 
+    rollup.remove_expense(db, db_expense)
     db.delete(db_expense)
+    bump_data_version(db, [current_user.id])
     db.commit()
 
 
 
-def get_total_spendings(db: Session, current_user: User) -> dict:
+# asyncpg accepts at most 32767 bind parameters per statement; the rest of
+# the budget is left for the filter and the patch
+BULK_MAX_IDS = 32000
+
+
+def _bulk_selection(statement, current_user: User, ids: list[int], expense_filter: ExpenseFilter):
+    if ids is None and expense_filter is None:
+        raise ValueError("Select expenses by ids or by filter")
+    # An empty selection must not fall through to "every expense of the user";
+    # filter fields that _filter_expenses skips are the falsy ones
+    if ids is not None and not ids:
+        raise ValueError("Select at least one expense")
+    if ids is not None and len(ids) > BULK_MAX_IDS:
+        raise ValueError(f"Select at most {BULK_MAX_IDS} expenses by id, or use a filter")
+    if expense_filter is not None and not any(expense_filter.model_dump().values()):
+        raise ValueError("Filter does not select any expenses")
+
+    statement = statement.filter(Expense.user_id == current_user.id)
+    if ids is not None:
+        statement = statement.filter(Expense.id.in_(ids))
+    if expense_filter is not None:
+        statement = _filter_expenses(statement, **expense_filter.model_dump())
+    return statement
+
+
+def bulk_update_expenses(
+    db: Session, bulk_update: ExpenseBulkUpdate, current_user: User
+) -> int:
     if current_user.role == "admin":
         raise PermissionError("Admins cannot have expenses")
-    
+
+    if current_user.is_approved == False:
+        raise PermissionError("User is not approved yet")
+
+    values = bulk_update.patch.model_dump(exclude_none=True)
+    if not values:
+        raise ValueError("Nothing to update")
+    if values.get("amount", 0) < 0:
+        raise ValueError("Amount cannot be negative")
+    if "category_id" in values and not (
+        db.query(Category.id).filter(Category.id == values["category_id"]).scalar()
+    ):
+        raise ValueError("Category not found")
+
+    # One UPDATE ... FROM over the locked selection, returning each row's old
+    # and new values so the rollup deltas match exactly what was changed,
+    # however many expenses the filter selects
+    old = _bulk_selection(
+        select(Expense.id, Expense.user_id, Expense.category_id, Expense.date, Expense.amount),
+        current_user,
+        bulk_update.ids,
+        bulk_update.filter,
+    ).with_for_update().subquery("old")
+    changed = db.execute(
+        update(Expense)
+        .where(Expense.id == old.c.id)
+        .values(**values)
+        .returning(
+            old.c.user_id,
+            old.c.category_id,
+            old.c.date,
+            old.c.amount,
+            Expense.user_id.label("new_user_id"),
+            Expense.category_id.label("new_category_id"),
+            Expense.date.label("new_date"),
+            Expense.amount.label("new_amount"),
+        ),
+        execution_options={"synchronize_session": False},
+    ).all()
+    if not changed:
+        return 0
+
+    rollup.remove_expense_rows(db, [row._mapping for row in changed])
+    rollup.add_expense_rows(db, [
+        {
+            "user_id": row.new_user_id,
+            "category_id": row.new_category_id,
+            "date": row.new_date,
+            "amount": row.new_amount,
+        }
+        for row in changed
+    ])
+    bump_data_version(db, [current_user.id])
+    db.commit()
+
+    return len(changed)
+
+
+def bulk_delete_expenses(
+    db: Session, bulk_delete: ExpenseBulkDelete, current_user: User
+) -> int:
+    if current_user.role == "admin":
+        raise PermissionError("Admins cannot have expenses")
+
+    if current_user.is_approved == False:
+        raise PermissionError("User is not approved yet")
+
+    deleted_rows = db.execute(
+        _bulk_selection(delete(Expense), current_user, bulk_delete.ids, bulk_delete.filter)
+        .returning(Expense.user_id, Expense.category_id, Expense.date, Expense.amount),
+        execution_options={"synchronize_session": False},
+    ).all()
+    rollup.remove_expense_rows(db, [row._mapping for row in deleted_rows])
+    if deleted_rows:
+        bump_data_version(db, [current_user.id])
+    db.commit()
+
+    return len(deleted_rows)
+
+
+def _total_spendings_columns(now: datetime) -> list:
+    return [
+        func.sum(case((Expense.date >= now - timedelta(days=7), Expense.amount))).label("week"),
+        func.sum(case((Expense.date >= now - timedelta(days=30), Expense.amount))).label("month"),
+        func.sum(case((Expense.date >= now - timedelta(days=365), Expense.amount))).label("year"),
+    ]
+
+
+def _monthly_spendings_columns(year: int, prefix: str) -> list:
+    return [
+        func.sum(
+            case((MonthlySpending.month == date(year, month, 1), MonthlySpending.total))
+        ).label(f"{prefix}_{month}")
+        for month in range(1, 13)
+    ]
+
+
+def _yearly_comparison_columns() -> list:
+    current_year = datetime.now().year
+    return _monthly_spendings_columns(current_year, "current_year") + _monthly_spendings_columns(
+        current_year - 1, "last_year"
+    )
+
+
+def _spending_statistics(db: Session, current_user: User, columns: list):
+    # The rolling windows are not month aligned, so they come from raw expenses,
+    # in a single conditional aggregation instead of one SUM query per window.
+    return db.query(*columns).filter(Expense.user_id == current_user.id).one()._mapping
+
+
+def _rollup_statistics(db: Session, current_user: User, columns: list):
+    return (
+        db.query(*columns)
+        .filter(MonthlySpending.user_id == current_user.id)
+        .one()
+        ._mapping
+    )
+
+
+def _category_rollup(db: Session, current_user: User, columns: list = None) -> list:
+    # One row per category, including unused ones, read from the monthly rollup
+    rows = (
+        db.query(
+            Category.name,
+            func.coalesce(func.sum(MonthlySpending.total), 0).label("total"),
+            *(columns or []),
+        )
+        .outerjoin(
+            MonthlySpending,
+            (MonthlySpending.category_id == Category.id)
+            & (MonthlySpending.user_id == current_user.id),
+        )
+        .group_by(Category.id, Category.name)
+        .order_by(Category.id)
+        .all()
+    )
+    return [row._mapping for row in rows]
+
+
+def _total_spendings(windows, total) -> dict:
+    return {
+        "week": windows["week"] or 0,
+        "month": windows["month"] or 0,
+        "year": windows["year"] or 0,
+        "total": total or 0,
+    }
+
+
+def _yearly_comparison(rows) -> dict:
+    return {
+        prefix: {
+            month: sum(row[f"{prefix}_{month}"] or 0 for row in rows)
+            for month in range(1, 13)
+        }
+        for prefix in ("current_year", "last_year")
+    }
+
+
+def get_dashboard_statistics(db: Session, current_user: User) -> dict:
+    if current_user.role == "admin":
+        raise PermissionError("Admins cannot have expenses")
+
     if not current_user.is_approved:
         raise PermissionError("User is not approved yet")
 
-    # Sum of expenses for the last 7 days (week)
-    week = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == current_user.id,
-        Expense.date >= datetime.now() - timedelta(days=7),
-    ).scalar()
-
-    # Sum of expenses for the last 30 days (month)
-    month = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == current_user.id,
-        Expense.date >= datetime.now() - timedelta(days=30),
-    ).scalar()
-
-    # Sum of expenses for the last 365 days (year)
-    year = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == current_user.id,
-        Expense.date >= datetime.now() - timedelta(days=365),
-    ).scalar()
-
-    # Sum of all expenses
-    total = db.query(func.sum(Expense.amount)).filter(
-        Expense.user_id == current_user.id
-    ).scalar()
+    windows = _spending_statistics(db, current_user, _total_spendings_columns(datetime.now()))
+    categories = _category_rollup(db, current_user, _yearly_comparison_columns())
 
     return {
-        "week": week if week else 0,
-        "month": month if month else 0,
-        "year": year if year else 0,
-        "total": total if total else 0,
+        "total_spendings": _total_spendings(windows, sum(row["total"] for row in categories)),
+        "yearly_comparison": _yearly_comparison(categories),
+        "category_spendings": {row["name"]: row["total"] for row in categories},
     }
 
 
+def get_total_spendings(db: Session, current_user: User) -> dict:
+    if current_user.role == "admin":
+        raise PermissionError("Admins cannot have expenses")
+    
+    if not current_user.is_approved:
+        raise PermissionError("User is not approved yet")
+
+    windows = _spending_statistics(db, current_user, _total_spendings_columns(datetime.now()))
+    rollup_total = _rollup_statistics(db, current_user, [func.sum(MonthlySpending.total).label("total")])
+    return _total_spendings(windows, rollup_total["total"])
+
+
 
 def get_total_spendings_by_category(
     db: Session, current_user: User, category_id: int, period: str
@@ -232,7 +657,7 @@ def get_total_spendings_by_category(
             .filter(
                 Expense.user_id == current_user.id,
                 Expense.category_id == category_id,
-                Expense.date >= datetime.now() - datetime.timedelta(days=7),
+                Expense.date >= datetime.now() - timedelta(days=7),
             )
             .with_entities(func.sum(Expense.amount))
             .scalar()
@@ -243,7 +668,7 @@ def get_total_spendings_by_category(
             .filter(
                 Expense.user_id == current_user.id,
                 Expense.category_id == category_id,
-                Expense.date >= datetime.now() - datetime.timedelta(days=30),
+                Expense.date >= datetime.now() - timedelta(days=30),
             )
             .with_entities(func.sum(Expense.amount))
             .scalar()
@@ -254,7 +679,7 @@ def get_total_spendings_by_category(
             .filter(
                 Expense.user_id == current_user.id,
                 Expense.category_id == category_id,
-                Expense.date >= datetime.now() - datetime.timedelta(days=365),
+                Expense.date >= datetime.now() - timedelta(days=365),
             )
             .with_entities(func.sum(Expense.amount))
             .scalar()
@@ -263,6 +688,10 @@ def get_total_spendings_by_category(
         raise ValueError("Invalid period")
 
 
+def _next_month_start(year: int, month: int) -> datetime:
+    return datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+
+
 def get_monthly_comparison(db: Session, current_user: User) -> dict:
     if current_user.role == "admin":
         raise PermissionError("Admins cannot have expenses")
@@ -280,7 +709,7 @@ def get_monthly_comparison(db: Session, current_user: User) -> dict:
         .filter(
             Expense.user_id == current_user.id,
             Expense.date >= datetime(current_year, current_month, 1),
-            Expense.date < datetime(current_year, current_month + 1, 1),
+            Expense.date < _next_month_start(current_year, current_month),
         )
         .with_entities(func.sum(Expense.amount))
         .scalar()
@@ -290,7 +719,7 @@ def get_monthly_comparison(db: Session, current_user: User) -> dict:
         .filter(
             Expense.user_id == current_user.id,
             Expense.date >= datetime(last_year, last_month, 1),
-            Expense.date < datetime(last_year, last_month + 1, 1),
+            Expense.date < _next_month_start(last_year, last_month),
         )
         .with_entities(func.sum(Expense.amount))
         .scalar()
@@ -322,7 +751,7 @@ def get_monthly_comparison_by_category(
             Expense.user_id == current_user.id,
             Expense.category_id == category_id,
             Expense.date >= datetime(current_year, current_month, 1),
-            Expense.date < datetime(current_year, current_month + 1, 1),
+            Expense.date < _next_month_start(current_year, current_month),
         )
         .with_entities(func.sum(Expense.amount))
         .scalar()
@@ -333,7 +762,7 @@ def get_monthly_comparison_by_category(
             Expense.user_id == current_user.id,
             Expense.category_id == category_id,
             Expense.date >= datetime(last_year, last_month, 1),
-            Expense.date < datetime(last_year, last_month + 1, 1),
+            Expense.date < _next_month_start(last_year, last_month),
         )
         .with_entities(func.sum(Expense.amount))
         .scalar()
@@ -352,32 +781,7 @@ def get_yearly_comparison(db: Session, current_user: User) -> dict:
     if current_user.is_approved == False:
         raise PermissionError("User is not approved yet")
     
-    current_year = datetime.now().year
-    last_year = current_year - 1
-
-    def get_monthly_expenses(year):
-        monthly_expenses = {}
-        for month in range(1, 13):
-            month_start = datetime(year, month, 1)
-            month_end = datetime(year, month + 1, 1) if month < 12 else datetime(year + 1, 1, 1)
-            monthly_expenses[month] = (
-                db.query(func.sum(Expense.amount))
-                .filter(
-                    Expense.user_id == current_user.id,
-                    Expense.date >= month_start,
-                    Expense.date < month_end,
-                )
-                .scalar() or 0
-            )
-        return monthly_expenses
-
-    current_year_spendings = get_monthly_expenses(current_year)
-    last_year_spendings = get_monthly_expenses(last_year)
-
-    return {
-        "current_year": current_year_spendings,
-        "last_year": last_year_spendings,
-    }
+    return _yearly_comparison([_rollup_statistics(db, current_user, _yearly_comparison_columns())])
 
 
 def get_yearly_comparison_by_category(
@@ -426,13 +830,84 @@ def get_category_spendings(db: Session, current_user: User) -> dict:
     if current_user.is_approved == False:
         raise PermissionError("User is not approved yet")
     
-    categories = db.query(Category).all()
-    category_spendings = {}
-    for category in categories:
-        category_spendings[category.name] = (
-            db.query(func.sum(Expense.amount))
-            .filter(Expense.user_id == current_user.id, Expense.category_id == category.id)
-            .scalar()
-            or 0
+    return {row["name"]: row["total"] for row in _category_rollup(db, current_user)}
+
+
+SERIES_GRANULARITIES = ("day", "week", "month", "quarter", "year")
+MAX_SERIES_BUCKETS = 1000
+
+
+def _bucket_start(day: date, granularity: str) -> date:
+    # Mirrors Postgres date_trunc so zero-filled buckets line up with the query
+    if granularity == "day":
+        return day
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    if granularity == "quarter":
+        return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+    return date(day.year, 1, 1)
+
+
+def _next_bucket(bucket: date, granularity: str) -> date:
+    if granularity == "day":
+        return bucket + timedelta(days=1)
+    if granularity == "week":
+        return bucket + timedelta(days=7)
+    if granularity == "year":
+        return date(bucket.year + 1, 1, 1)
+    months = 1 if granularity == "month" else 3
+    month_index = bucket.month - 1 + months
+    return date(bucket.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def get_spending_series(
+    db: Session,
+    current_user: User,
+    start_date: date,
+    end_date: date,
+    granularity: str,
+    category_id: int = None,
+) -> list[dict]:
+    if current_user.role == "admin":
+        raise PermissionError("Admins cannot have expenses")
+
+    if current_user.is_approved == False:
+        raise PermissionError("User is not approved yet")
+
+    if granularity not in SERIES_GRANULARITIES:
+        raise ValueError("Invalid granularity")
+    if start_date > end_date:
+        raise ValueError("Start date must not be after end date")
+
+    buckets = []
+    bucket = _bucket_start(start_date, granularity)
+    while bucket <= end_date:
+        buckets.append(bucket)
+        if len(buckets) > MAX_SERIES_BUCKETS:
+            raise ValueError("Too many buckets for the requested range")
+        bucket = _next_bucket(bucket, granularity)
+
+    period = cast(func.date_trunc(granularity, Expense.date), Date).label("period")
+    query = (
+        db.query(period, func.sum(Expense.amount), func.count(Expense.id))
+        .filter(
+            Expense.user_id == current_user.id,
+            Expense.date >= start_date,
+            Expense.date <= end_date,
         )
-    return category_spendings
\ No newline at end of file
+    )
+    if category_id:
+        query = query.filter(Expense.category_id == category_id)
+
+    totals = {row[0]: (row[1], row[2]) for row in query.group_by(period).all()}
+
+    return [
+        {
+            "period": bucket,
+            "total": totals.get(bucket, (0, 0))[0],
+            "count": totals.get(bucket, (0, 0))[1],
+        }
+        for bucket in buckets
+    ]
@@ -0,0 +1,148 @@
+from datetime import date
+from sqlalchemy import Date, cast, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from app.models import Expense, MonthlySpending
+
+
+def _month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _upsert(rows):
+    # Adds to an existing (user, category, month) row instead of overwriting it
+    return rows.on_conflict_do_update(
+        index_elements=[
+            MonthlySpending.user_id,
+            MonthlySpending.category_id,
+            MonthlySpending.month,
+        ],
+        set_={
+            "total": MonthlySpending.total + rows.excluded.total,
+            "count": MonthlySpending.count + rows.excluded.count,
+        },
+    )
+
+
+# Adds amount/count to the bucket of one expense; the caller commits
+def apply_expense_delta(
+    db: Session, user_id: int, category_id: int, expense_date: date, amount: float, count: int
+):
+    month = _month_start(expense_date)
+    db.execute(
+        _upsert(
+            insert(MonthlySpending).values(
+                user_id=user_id,
+                category_id=category_id,
+                month=month,
+                total=amount,
+                count=count,
+            )
+        )
+    )
+    if count < 0:
+        db.execute(
+            delete(MonthlySpending).where(
+                MonthlySpending.user_id == user_id,
+                MonthlySpending.category_id == category_id,
+                MonthlySpending.month == month,
+                MonthlySpending.count <= 0,
+            )
+        )
+
+
+def add_expense(db: Session, expense: Expense):
+    apply_expense_delta(db, expense.user_id, expense.category_id, expense.date, expense.amount, 1)
+
+
+def remove_expense(db: Session, expense: Expense):
+    apply_expense_delta(db, expense.user_id, expense.category_id, expense.date, -expense.amount, -1)
+
+
+# Buckets per upsert, five bind parameters each, well under asyncpg's 32767
+_BUCKETS_PER_STATEMENT = 5000
+
+
+def _apply_expense_rows(db: Session, rows: list, sign: int):
+    buckets = {}
+    for row in rows:
+        key = (row["user_id"], row["category_id"], _month_start(row["date"]))
+        total, count = buckets.get(key, (0, 0))
+        buckets[key] = (total + sign * row["amount"], count + sign)
+    if not buckets:
+        return
+    values = [
+        {
+            "user_id": user_id,
+            "category_id": category_id,
+            "month": month,
+            "total": total,
+            "count": count,
+        }
+        for (user_id, category_id, month), (total, count) in buckets.items()
+    ]
+    for start in range(0, len(values), _BUCKETS_PER_STATEMENT):
+        db.execute(
+            _upsert(insert(MonthlySpending).values(values[start:start + _BUCKETS_PER_STATEMENT]))
+        )
+    if sign < 0:
+        db.execute(
+            delete(MonthlySpending).where(
+                MonthlySpending.user_id.in_({user_id for user_id, _, _ in buckets}),
+                MonthlySpending.count <= 0,
+            )
+        )
+
+
+# Adds a batch of expense rows with one multi-row upsert; the caller commits
+def add_expense_rows(db: Session, rows: list):
+    _apply_expense_rows(db, rows, 1)
+
+
+# Subtracts a batch of expense rows with one multi-row upsert; the caller commits
+def remove_expense_rows(db: Session, rows: list):
+    _apply_expense_rows(db, rows, -1)
+
+
+# Merges every bucket of one category into another; the caller commits
+def move_category(db: Session, from_category_id: int, to_category_id: int):
+    moved = select(
+        MonthlySpending.user_id,
+        literal(to_category_id),
+        MonthlySpending.month,
+        MonthlySpending.total,
+        MonthlySpending.count,
+    ).where(MonthlySpending.category_id == from_category_id)
+    db.execute(
+        _upsert(
+            insert(MonthlySpending).from_select(
+                ["user_id", "category_id", "month", "total", "count"], moved
+            )
+        )
+    )
+    db.execute(
+        delete(MonthlySpending).where(MonthlySpending.category_id == from_category_id)
+    )
+
+
+# Recomputes the whole rollup table from the expenses table
+def rebuild_monthly_spendings(db: Session):
+    # A full rebuild may run longer than the API's statement_timeout
+    db.execute(text("SET LOCAL statement_timeout = 0"))
+    # Writers wait for the rebuild so no delta is applied to a half-built table
+    db.execute(text("LOCK TABLE expenses IN SHARE MODE"))
+    db.execute(delete(MonthlySpending))
+    month = cast(func.date_trunc("month", Expense.date), Date)
+    db.execute(
+        insert(MonthlySpending).from_select(
+            ["user_id", "category_id", "month", "total", "count"],
+            select(
+                Expense.user_id,
+                Expense.category_id,
+                month,
+                func.sum(Expense.amount),
+                func.count(Expense.id),
+            ).group_by(Expense.user_id, Expense.category_id, month),
+        )
+    )
+    db.commit()
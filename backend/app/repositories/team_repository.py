@@ -1,7 +1,13 @@
-from sqlalchemy import func
-from sqlalchemy.orm import Session
-from app.models import Category, Expense, Team, User
+from sqlalchemy import func, update
+from sqlalchemy.orm import Session, selectinload
+from app.core.config import settings
+from app.models import Category, MonthlySpending, Team, User
+from app.schemas.team_schema import TeamInfo, TeamPage
 from app.schemas.user_schema import UserDisplay
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.principal_cache import principal_cache
+from app.utils.search import matches, relevance
+from app.utils.serialization import validate_list
 
 def get_team(db: Session, current_user: User) -> list[UserDisplay]:
     if current_user.role != "manager":
@@ -16,44 +22,39 @@ def create_team(db: Session, team_name: str, current_user: User):
     db.commit()
     db.refresh(team)
 
-def get_all_teams(db: Session, current_user: User) -> list[dict]:
+def get_all_teams(
+    db: Session,
+    current_user: User,
+    name: str = None,
+    limit: int = settings.TEAMS_PAGE_SIZE,
+    cursor: str = None,
+) -> TeamPage:
     if current_user.role != "admin":
         raise PermissionError("You are not an admin")
-
-    teams = db.query(Team).all()
-    result = []
-
-    for team in teams:
-        users = db.query(User).filter(User.team_id == team.id).all()
-        manager = db.query(User).filter(User.id == team.manager_id).first()
-
-        manager_info = None
-        user_info = []
-        if users is not None:
-            user_info = [
-                {
-                    "id": user.id,
-                    "name": user.name,
-                    "surname": user.surname,
-                    "email": user.email,
-                    "role": user.role,
-                }
-                for user in users
-            ]
-        if manager is not None:
-            manager_info = {
-                "id": manager.id,
-                "name": manager.name,
-                "surname": manager.surname,
-                "email": manager.email,
-                "role": manager.role,
-            }
-
-        team_info = {"team": team, "manager": manager_info, "users": user_info}
-
-        result.append(team_info)
-
-    return result
+    if limit < 1 or limit > settings.TEAMS_MAX_PAGE_SIZE:
+        raise ValueError("Invalid page size")
+
+    # One query for the page of teams, then one selectin query each for all
+    # their members and all their managers, however many teams the page has
+    query = db.query(Team).options(selectinload(Team.members), selectinload(Team.manager))
+    if name:
+        query = query.filter(matches([Team.name], name))
+    if cursor:
+        position = decode_cursor(cursor)
+        if position["sort_by"] != "id":
+            raise ValueError("Invalid cursor")
+        query = query.filter(Team.id > position["id"])
+
+    teams = query.order_by(Team.id).limit(limit + 1).all()
+    has_more = len(teams) > limit
+    teams = teams[:limit]
+
+    items = validate_list(
+        TeamInfo,
+        [{"team": team, "manager": team.manager, "users": team.members} for team in teams],
+    )
+    next_cursor = encode_cursor("id", "asc", teams[-1].id, teams[-1].id, "next") if has_more else None
+    return TeamPage(items=items, next_cursor=next_cursor)
 
 def delete_team(db: Session, team_id: int, current_user: User):
     if current_user.role != "admin":
@@ -62,12 +63,14 @@ def delete_team(db: Session, team_id: int, current_user: User):
     if team is None:
         raise ValueError("Team not found")
 
-    users_in_team = db.query(User).filter(User.team_id == team.id).all()
-    for user in users_in_team:
-        user.team_id = None
-
+    # Members leave the team in one UPDATE rather than one per member
+    member_ids = db.execute(
+        update(User).where(User.team_id == team_id).values(team_id=None).returning(User.id),
+        execution_options={"synchronize_session": False},
+    ).scalars().all()
     db.delete(team)
     db.commit()
+    principal_cache.invalidate_users(member_ids)
 
 def add_team_member(db: Session, user_id: int, team_id: int, current_user: User):
 
@@ -90,6 +93,7 @@ def add_team_member(db: Session, user_id: int, team_id: int, current_user: User)
         user.team_id = team_id
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate_users([user_id])
 
 def delete_team_member(db: Session, user_id: int, team_id: int, current_user: User):
     if current_user.role != "admin":
@@ -108,6 +112,7 @@ def delete_team_member(db: Session, user_id: int, team_id: int, current_user: Us
     user.team_id = None
     db.commit()
     db.refresh(user)
+    principal_cache.invalidate_users([user_id])
 
 def get_team_expenses(db: Session, current_user: User) -> dict:
     if current_user.role != "manager":
@@ -123,10 +128,11 @@ def get_team_expenses(db: Session, current_user: User) -> dict:
             User.name.label("user_name"),
             User.surname.label("user_surname"),
             Category.name.label("category_name"),
-            func.sum(Expense.amount).label("total_expenses"),
+            func.sum(MonthlySpending.total).label("total_expenses"),
         )
-        .join(User, User.id == Expense.user_id)
-        .join(Category, Category.id == Expense.category_id)
+        .select_from(MonthlySpending)
+        .join(User, User.id == MonthlySpending.user_id)
+        .join(Category, Category.id == MonthlySpending.category_id)
         .filter(User.team_id == existing_team.id)
         .group_by(User.id, User.name, User.surname, Category.name)
         .all()
@@ -151,9 +157,10 @@ def get_team_expenses_by_category(db: Session, current_user: User) -> dict:
         raise PermissionError("You are not a manager")
 
     expenses = (
-        db.query(Category.name, func.sum(Expense.amount).label("total_amount"))
-        .join(User)
-        .join(Category)
+        db.query(Category.name, func.sum(MonthlySpending.total).label("total_amount"))
+        .select_from(MonthlySpending)
+        .join(User, User.id == MonthlySpending.user_id)
+        .join(Category, Category.id == MonthlySpending.category_id)
         .filter(User.team_id == current_user.team_id)
         .group_by(Category.name)
         .all()
@@ -162,30 +169,27 @@ def get_team_expenses_by_category(db: Session, current_user: User) -> dict:
     return {category: total_amount for category, total_amount in expenses}
 
 def get_users_without_team(
-    db: Session, current_user: User, name_or_surname: str
+    db: Session,
+    current_user: User,
+    name_or_surname: str,
+    limit: int = settings.USERS_PAGE_SIZE,
+    offset: int = 0,
 ) -> list[UserDisplay]:
     if current_user.role != "admin":
         raise PermissionError("You are not an admin")
-    query = db.query(User).filter(
-        User.team_id == None, User.role != "admin", User.is_approved == True
+    if limit < 1 or limit > settings.USERS_MAX_PAGE_SIZE or offset < 0:
+        raise ValueError("Invalid page")
+
+    # Managers keep team_id empty, so the ones already leading a team are left
+    # out with an anti-join on teams.manager_id rather than a lookup per user
+    manages_team = db.query(Team.id).filter(Team.manager_id == User.id).exists()
+    query = db.query(User.id, User.name, User.surname, User.email).filter(
+        User.team_id == None, User.role != "admin", User.is_approved == True, ~manages_team
     )
 
     if name_or_surname:
-        query = query.filter(
-            (User.name.contains(name_or_surname))
-            | (User.surname.contains(name_or_surname))
-        )
-
-    users = query.all()
+        query = query.filter(matches([User.name, User.surname], name_or_surname))
+        query = query.order_by(relevance(db, [User.name, User.surname], name_or_surname))
 
-    user_display_list = [
-        UserDisplay(
-            id=user.id,
-            name=user.name,
-            surname=user.surname,
-            email=user.email,
-        )
-        for user in users if not db.query(Team).filter(Team.manager_id == user.id).first()
-    ]
-    
-    return user_display_list
+    users = query.order_by(User.id).limit(limit).offset(offset).all()
+    return validate_list(UserDisplay, users)
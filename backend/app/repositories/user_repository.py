@@ -1,6 +1,10 @@
-from app.models import Team, User
+from app.models import CatalogVersion, Team, User
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from app.schemas.user_schema import UserBase
+from app.utils.principal_cache import principal_cache
+from app.utils.search import matches, relevance
 
 
 def get_user_by_email(db: Session, email: str) -> UserBase:
@@ -11,6 +15,49 @@ def get_user_by_id(db: Session, user_id: int) -> User:
     return db.query(User).filter(User.id == user_id).first()
 
 
+# The per-user values behind ETags and replica stickiness, plus the shared
+# catalog version, in one query. They are read fresh from the primary rather
+# than from the principal cache, which other workers would only refresh after
+# its TTL.
+def get_data_state(db: Session, user_id: int):
+    catalog_version = (
+        select(CatalogVersion.version).where(CatalogVersion.id == 1).scalar_subquery()
+    )
+    return (
+        db.query(
+            User.data_version,
+            User.data_changed_at,
+            func.coalesce(catalog_version, 0).label("catalog_version"),
+        )
+        .filter(User.id == user_id)
+        .first()
+    )
+
+
+# Invalidates the ETags of the given users' expense reads and pins their reads
+# to the primary for a short while; runs in the caller's transaction so it
+# commits with the write
+def bump_data_version(db: Session, user_ids: list[int]):
+    db.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        .values(data_version=User.data_version + 1, data_changed_at=func.now()),
+        execution_options={"synchronize_session": False},
+    )
+
+
+# Invalidates every user's expense ETags at once when categories change, with
+# a single-row update rather than one per user
+def bump_catalog_version(db: Session):
+    db.execute(
+        pg_insert(CatalogVersion)
+        .values(id=1, version=1)
+        .on_conflict_do_update(
+            index_elements=[CatalogVersion.id], set_={"version": CatalogVersion.version + 1}
+        )
+    )
+
+
 def get_users(db: Session, current_user: User) -> list[UserBase]:
     if current_user.role != "admin":
         raise PermissionError("You are not an admin")
@@ -28,12 +75,14 @@ def get_filtered_users(db: Session, current_user: User, status: str, email: str,
     if status:
         query = query.filter(User.is_approved == (status.lower() == "approved"))
     if email:
-        query = query.filter(User.email.contains(email))
+        query = query.filter(matches([User.email], email))
+        query = query.order_by(relevance(db, [User.email], email))
     if name_or_surname:
-        query = query.filter((User.name.contains(name_or_surname)) | (User.surname.contains(name_or_surname)))
+        query = query.filter(matches([User.name, User.surname], name_or_surname))
+        query = query.order_by(relevance(db, [User.name, User.surname], name_or_surname))
     if role:
         query = query.filter(User.role.contains(role))
-    return query.all()
+    return query.order_by(User.id).all()
 
 def approve_user(db: Session, user_id: int, current_user: User):
     if current_user.role != "admin":
@@ -46,6 +95,7 @@ def approve_user(db: Session, user_id: int, current_user: User):
     existing_user.is_approved = True
     db.commit()
     db.refresh(existing_user)
+    principal_cache.invalidate_users([user_id])
 
 
 def change_user_role(db: Session, user_id: int, current_user: User):
@@ -66,6 +116,7 @@ def change_user_role(db: Session, user_id: int, current_user: User):
         existing_user.role = "manager"
     db.commit()
     db.refresh(existing_user)
+    principal_cache.invalidate_users([user_id])
 
 
 def delete_user(db: Session, user_id: int, current_user: User):
@@ -76,4 +127,5 @@ def delete_user(db: Session, user_id: int, current_user: User):
     if not user:
         raise ValueError("User not found")
     db.delete(user)
-    db.commit()
\ No newline at end of file
+    db.commit()
+    principal_cache.invalidate_users([user_id])
\ No newline at end of file
@@ -1,53 +1,75 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
-from app.database import get_db
+from app.database import get_async_db, get_db
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.schemas.user_schema import UserRegister, Token, TokenRequest
-from app.repositories.user_repository import get_user_by_email
+from app.schemas.common_schema import MessageResponse
+from app.schemas.user_schema import (
+    LoginResponse,
+    RefreshedToken,
+    ResetPasswordResponse,
+    TokenRequest,
+    TokenStatus,
+    UserRegister,
+)
+from app.utils.password_hasher import PasswordHasherBusy
 import app.repositories.auth_repository as repo
+import app.repositories.auth_async_repository as async_repo
 
 router = APIRouter()
 
+hasher_busy_exception = HTTPException(
+    status_code=503,
+    detail="Too many password operations in progress, try again shortly",
+    headers={"Retry-After": "1"},
+)
+
 
 # Register a new user
-@router.post("/register")
-def register(user: UserRegister, db: Session = Depends(get_db)):
+@router.post("/register", response_model=MessageResponse)
+async def register(user: UserRegister, db: AsyncSession = Depends(get_async_db)):
         try:
-            repo.create_user(db, user)
+            await async_repo.create_user(db, user)
             return {"message": "User created successfully"}
         except ValueError as e:
             raise HTTPException(status_code=409, detail=str(e))
+        except PasswordHasherBusy:
+            raise hasher_busy_exception
         except Exception as e:
             raise HTTPException(status_code=500, detail=str(e))
 
 
 # Login and get an access token
-@router.post("/token")
-def login(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+@router.post("/token", response_model=LoginResponse)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)
 ):
     try:
-        user_data = repo.authenticate_user(db, form_data.username, form_data.password)
+        user_data = await async_repo.authenticate_user(db, form_data.username, form_data.password)
         return {"access_token": user_data["access_token"], "role": user_data["role"] ,"token_type": "bearer", "message": "Login successful"} 
     except ValueError as e:
         if str(e) == "User not found":
             raise HTTPException(status_code=404, detail="User not found")
         elif str(e) == "Incorrect password":
             raise HTTPException(status_code=401, detail="Incorrect password")
+    except PasswordHasherBusy:
+        raise hasher_busy_exception
 
 
 # Reset password
-@router.post("/reset-password")
-def reset_password(email: str, db: Session = Depends(get_db)):
+@router.post("/reset-password", response_model=ResetPasswordResponse)
+async def reset_password(email: str, db: AsyncSession = Depends(get_async_db)):
     try:
-        password = repo.reset_password(db, email)
+        password = await async_repo.reset_password(db, email)
         return {"password": password}
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except PasswordHasherBusy:
+        raise hasher_busy_exception
 
 
 # Check if a token is valid
-@router.post("/check-token")
+@router.post("/check-token", response_model=TokenStatus)
 def check_token(token: TokenRequest, db: Session = Depends(get_db)):
     payload = repo.decode_access_token(token.token)
     if not payload:
@@ -59,7 +81,7 @@ def check_token(token: TokenRequest, db: Session = Depends(get_db)):
 
 
 # Refresh an access token
-@router.post("/refresh-token")
+@router.post("/refresh-token", response_model=RefreshedToken)
 def refresh_token(token: str, db: Session = Depends(get_db)):
     new_access_token = repo.refresh_token(db, token)
     if not new_access_token:
@@ -2,8 +2,10 @@ from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.schemas.category_schema import CategoryUpdate, CategoryCreate
+from app.schemas.category_schema import CategoryAdminView, CategoryDisplay, CategoryUpdate, CategoryCreate
+from app.schemas.common_schema import MessageResponse
 from app.utils.security import get_current_user
+from app.utils.serialization import list_response
 from app.models import User
 import app.repositories.category_repository as repo
 
@@ -11,7 +13,7 @@ router = APIRouter()
 
 
 # List all the categories
-@router.get("/admin/categories")
+@router.get("/admin/categories", response_model=list[CategoryAdminView])
 def get_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -19,7 +21,7 @@ def get_categories(
     name: Optional[str] = Query(None, description="Search by name"),
 ):
     try:
-        return repo.get_categories_for_admin(db, current_user, ascending, name)
+        return list_response(CategoryAdminView, repo.get_categories_for_admin(db, current_user, ascending, name))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
@@ -30,13 +32,13 @@ def get_categories(
 
 
 # For everyone lis all the categories
-@router.get("/categories")
+@router.get("/categories", response_model=list[CategoryDisplay])
 def get_categories(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
     try:
-        return repo.get_categories(db, current_user)
+        return list_response(CategoryDisplay, repo.get_categories(db, current_user))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
@@ -47,7 +49,7 @@ def get_categories(
 
 
 # Create a new category
-@router.post("/categories")
+@router.post("/categories", response_model=MessageResponse)
 def create_category(
     category: CategoryCreate,
     db: Session = Depends(get_db),
@@ -68,7 +70,7 @@ def create_category(
 
 
 # Update an existing category
-@router.put("/categories/{category_id}")
+@router.put("/categories/{category_id}", response_model=MessageResponse)
 def update_category(
     category: CategoryUpdate,
     db: Session = Depends(get_db),
@@ -92,7 +94,7 @@ def update_category(
 
 
 # Delete an existing category
-@router.delete("/categories/{category_id}")
+@router.delete("/categories/{category_id}", response_model=MessageResponse)
 def delete_category(
     category_id: int,
     db: Session = Depends(get_db),
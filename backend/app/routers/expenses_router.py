@@ -1,43 +1,132 @@
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.database import get_db
+from app.core.config import settings
+from app.database import get_async_db, get_db, read_session_factory
 from app.models import User
-from app.utils.security import get_current_user
+from app.utils.security import get_current_user, get_current_user_async
+from app.utils.conditional import expense_etag
+from app.utils.read_routing import get_async_read_db, get_current_data_state
+from app.utils.expense_io import MEDIA_TYPES, detect_format
+from app.utils.expense_filter import parse_filter
+from app.utils.serialization import list_response
 import app.repositories.expenses_repository as repo
-from app.schemas.expense_schema import ExpenseCreate, ExpenseUpdate
+import app.repositories.expenses_async_repository as async_repo
+from app.schemas.common_schema import MessageResponse
+from app.schemas.expense_schema import (
+    DashboardStatistics,
+    ExpenseBulkDelete,
+    ExpenseBulkDeleteResult,
+    ExpenseBulkUpdate,
+    ExpenseBulkUpdateResult,
+    ExpenseCreate,
+    ExpenseImportResult,
+    ExpenseList,
+    ExpenseUpdate,
+    ExpenseView,
+    SpendingBucket,
+    TotalSpendings,
+    YearlyComparison,
+)
 
 
 router = APIRouter()
 
 
-# List all expenses of the current user
-@router.get("/expenses")
-def get_expenses(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user),
+# List all expenses of the current user, one keyset page at a time
+@router.get("/expenses", response_model=list[ExpenseList])
+async def get_expenses(
+    db: AsyncSession = Depends(get_async_read_db), current_user: User = Depends(get_current_user_async),
     expense_name: Optional[str] = Query(None, description="Search by name"),
     expense_amount: Optional[float] = Query(None, description="Search by amount"),
     expense_category: Optional[int] = Query(None, description="Search by category"),
     expense_date: Optional[date] = Query(None, description="Search by date"),
+    sort_by: str = Query("date", description="Sort by date, amount, name or category"),
+    sort_order: str = Query("desc", description="Sort order asc/desc"),
+    limit: int = Query(settings.EXPENSES_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor or X-Prev-Cursor"),
+    expression: Optional[str] = Query(None, alias="filter", description="JSON filter expression"),
+    cache_headers: dict = Depends(expense_etag),
 ):
     try:
-        return repo.get_expenses(db, current_user, expense_name, expense_amount, expense_category, expense_date)
+        page = await async_repo.get_expenses(
+            db, current_user, expense_name, expense_amount, expense_category, expense_date,
+            sort_by, sort_order, limit, cursor, parse_filter(expression) if expression else None,
+        )
+        headers = dict(cache_headers)
+        if page.next_cursor:
+            headers["X-Next-Cursor"] = page.next_cursor
+        if page.prev_cursor:
+            headers["X-Prev-Cursor"] = page.prev_cursor
+        return list_response(ExpenseList, page.items, headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 
-# Create a new expense
-@router.post("/expenses")
-def create_expense(
-    expense: ExpenseCreate,
+# Export expenses of the current user (or of the manager's team) as a stream
+@router.get("/expenses/export")
+def export_expenses(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    file_format: str = Query("csv", alias="format", description="csv or ndjson"),
+    expense_name: Optional[str] = Query(None, description="Search by name"),
+    expense_amount: Optional[float] = Query(None, description="Search by amount"),
+    expense_category: Optional[int] = Query(None, description="Search by category"),
+    expense_date: Optional[date] = Query(None, description="Search by date"),
+    start_date: Optional[date] = Query(None, description="Earliest date to include"),
+    end_date: Optional[date] = Query(None, description="Latest date to include"),
+    team: bool = Query(False, description="Managers: export the whole team"),
+    expression: Optional[str] = Query(None, alias="filter", description="JSON filter expression"),
+    data_state=Depends(get_current_data_state),
+):
+    # The request session is closed before a streamed body is sent, so the
+    # export reads through a session of its own that lives as long as the stream.
+    export_db = read_session_factory(data_state.data_changed_at)()
+    try:
+        chunks = repo.export_expenses(
+            export_db, current_user, file_format, expense_name, expense_amount,
+            expense_category, expense_date, start_date, end_date, team,
+            parse_filter(expression) if expression else None,
+        )
+    except ValueError as e:
+        export_db.close()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PermissionError as e:
+        export_db.close()
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        export_db.close()
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
+
+    def stream():
+        try:
+            yield from chunks
+        finally:
+            export_db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES[file_format],
+        headers={"Content-Disposition": f'attachment; filename="expenses.{file_format}"'},
+    )
+
+
+# Create a new expense
+@router.post("/expenses", response_model=MessageResponse)
+async def create_expense(
+    expense: ExpenseCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        repo.create_expense(db, expense, current_user)
+        await async_repo.create_expense(db, expense, current_user)
         return {"message": "Expense created successfully"}
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -47,16 +136,34 @@ def create_expense(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 
+# Import expenses from an uploaded CSV or NDJSON file
+@router.post("/expenses/import", response_model=ExpenseImportResult)
+def import_expenses(
+    file: UploadFile = File(..., description="CSV with a header row, or one JSON object per line"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    try:
+        file_format = detect_format(file.filename, file.content_type)
+        return repo.import_expenses(db, current_user, file.file, file_format)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
+
+
 # Update an existing expense
-@router.put("/expenses/{expense_id}")
-def update_expense(
+@router.put("/expenses/{expense_id}", response_model=ExpenseView)
+async def update_expense(
     expense_id: int,
     expense: ExpenseUpdate,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        return repo.update_expense(db, expense_id, expense, current_user)
+        return await async_repo.update_expense(db, expense_id, expense, current_user)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except PermissionError as e:
@@ -66,14 +173,14 @@ def update_expense(
 
 
 # Delete an existing expense
-@router.delete("/expenses/{expense_id}")
-def delete_expense(
+@router.delete("/expenses/{expense_id}", response_model=MessageResponse)
+async def delete_expense(
     expense_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
 ):
     try:
-        repo.delete_expense(db, expense_id, current_user)
+        await async_repo.delete_expense(db, expense_id, current_user)
         return {"message": "Expense deleted successfully"}
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -83,14 +190,63 @@ def delete_expense(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 
+# Apply one patch to many expenses selected by ids or by filter
+@router.post("/expenses/bulk-update", response_model=ExpenseBulkUpdateResult)
+async def bulk_update_expenses(
+    bulk_update: ExpenseBulkUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        return {"updated": await async_repo.bulk_update_expenses(db, bulk_update, current_user)}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
+
+
+# Delete many expenses selected by ids or by filter
+@router.post("/expenses/bulk-delete", response_model=ExpenseBulkDeleteResult)
+async def bulk_delete_expenses(
+    bulk_delete: ExpenseBulkDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    try:
+        return {"deleted": await async_repo.bulk_delete_expenses(db, bulk_delete, current_user)}
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
+
+
+# Get all dashboard statistics of the current user in one round trip
+@router.get("/expenses/statistics/dashboard", response_model=DashboardStatistics)
+async def get_dashboard_statistics(
+    db: AsyncSession = Depends(get_async_read_db), current_user: User = Depends(get_current_user_async),
+    cache_headers: dict = Depends(expense_etag),
+):
+    try:
+        return await async_repo.get_dashboard_statistics(db, current_user)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
+
+
 # Get total spendings of the current user
-@router.get("/expenses/statistics/total-spendings")
-def get_total_spendings(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+@router.get("/expenses/statistics/total-spendings", response_model=TotalSpendings)
+async def get_total_spendings(
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    cache_headers: dict = Depends(expense_etag),
 ):
     try:
-        return repo.get_total_spendings(db, current_user)
+        return await async_repo.get_total_spendings(db, current_user)
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except PermissionError as e:
@@ -100,24 +256,47 @@ def get_total_spendings(
 
 
 # Get yearly comparison of the current user
-@router.get("/expenses/statistics/yearly-comparison")
-def get_yearly_comparison(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+@router.get("/expenses/statistics/yearly-comparison", response_model=YearlyComparison)
+async def get_yearly_comparison(
+    db: AsyncSession = Depends(get_async_read_db), current_user: User = Depends(get_current_user_async),
+    cache_headers: dict = Depends(expense_etag),
 ):
     try:
-        return repo.get_yearly_comparison(db, current_user)
+        return await async_repo.get_yearly_comparison(db, current_user)
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 # Get category spendings of the current user
-@router.get("/expenses/statistics/category-spendings")
-def get_category_spendings(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+@router.get("/expenses/statistics/category-spendings", response_model=dict[str, float])
+async def get_category_spendings(
+    db: AsyncSession = Depends(get_async_read_db), current_user: User = Depends(get_current_user_async),
+    cache_headers: dict = Depends(expense_etag),
 ):
     try:
-        return repo.get_category_spendings(db, current_user)
+        return await async_repo.get_category_spendings(db, current_user)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
+
+
+# Get spendings of the current user bucketed by day/week/month/quarter/year
+@router.get("/expenses/statistics/series", response_model=list[SpendingBucket])
+async def get_spending_series(
+    start_date: date = Query(..., description="First day of the range"),
+    end_date: date = Query(..., description="Last day of the range"),
+    granularity: str = Query("month", description="day, week, month, quarter or year"),
+    category_id: Optional[int] = Query(None, description="Filter by category"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user_async),
+    cache_headers: dict = Depends(expense_etag),
+):
+    try:
+        return await async_repo.get_spending_series(db, current_user, start_date, end_date, granularity, category_id)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
@@ -0,0 +1,18 @@
+import secrets
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from app.core.config import settings
+from app.utils.metrics import registry
+
+router = APIRouter()
+
+
+# Prometheus scrape endpoint; when METRICS_TOKEN is set the scraper must send it as a bearer token
+@router.get("/metrics", response_class=Response)
+def get_metrics(authorization: Optional[str] = Header(None)):
+    if settings.METRICS_TOKEN and not secrets.compare_digest(
+        authorization or "", f"Bearer {settings.METRICS_TOKEN}"
+    ):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app import database
+from app.models import User
+from app.schemas.monitoring_schema import PasswordHasherStatus, PoolStatus
+from app.utils.password_hasher import password_hasher
+from app.utils.pool_stats import pool_status
+from app.utils.security import get_current_user
+
+router = APIRouter()
+
+
+def _require_admin(current_user: User):
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="You are not an admin")
+
+
+# Connection pool usage of this worker's engines, for sizing workers against Postgres
+@router.get("/admin/db-pool", response_model=dict[str, PoolStatus])
+def get_db_pool(current_user: User = Depends(get_current_user)):
+    _require_admin(current_user)
+    return {name: pool_status(engine) for name, engine in database.pool_engines().items()}
+
+
+# Queue depth and latency of this worker's password hashing pool
+@router.get("/admin/password-hasher", response_model=PasswordHasherStatus)
+def get_password_hasher(current_user: User = Depends(get_current_user)):
+    _require_admin(current_user)
+    return password_hasher.status()
@@ -1,10 +1,14 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.database import get_db
-from app.schemas.team_schema import TeamCreate
-from app.schemas.user_schema import UserTeamAdd
+from app.schemas.common_schema import MessageResponse
+from app.schemas.team_schema import TeamCreate, TeamInfo, TeamMemberSpendings
+from app.schemas.user_schema import UserBase, UserDisplay, UserTeamAdd
 from app.utils.security import get_current_user
+from app.utils.read_routing import get_read_db
+from app.utils.serialization import list_response
 from app.models import User
 import app.repositories.team_repository as repo
 
@@ -12,44 +16,57 @@ router = APIRouter()
 
 
 # For manager list all team members
-@router.get("/team")
+@router.get("/team", response_model=list[UserBase])
 def get_team(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
 ):
     try:
-        return repo.get_team(db, current_user)
+        return list_response(UserBase, repo.get_team(db, current_user))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
  
-# For Admin list all teams
-@router.get("/team/all")
+# For Admin list all teams with their managers and members, one page at a time
+@router.get("/team/all", response_model=list[TeamInfo])
 def get_all_teams(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db), current_user: User = Depends(get_current_user),
+    name: Optional[str] = Query(None, description="Search by team name"),
+    limit: int = Query(settings.TEAMS_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
 ):
     try:
-        return repo.get_all_teams(db, current_user)
+        page = repo.get_all_teams(db, current_user, name, limit, cursor)
+        headers = {"X-Next-Cursor": page.next_cursor} if page.next_cursor else None
+        return list_response(TeamInfo, page.items, headers=headers)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
     
 # For Admin list all users without a team
-@router.get("/team/users") 
+@router.get("/team/users", response_model=list[UserDisplay])
 def get_users_without_team(
     db: Session = Depends(get_db), current_user: User = Depends(get_current_user),
     name_or_surname: Optional[str] = Query(None, description="Search by name or surname"),
+    limit: int = Query(settings.USERS_PAGE_SIZE, description="Page size"),
+    offset: int = Query(0, description="Users to skip"),
 ):
     try:
-        return repo.get_users_without_team(db, current_user, name_or_surname)
+        return list_response(
+            UserDisplay, repo.get_users_without_team(db, current_user, name_or_surname, limit, offset)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except PermissionError as e:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 # For Admin create a new team
-@router.post("/team/create")
+@router.post("/team/create", response_model=MessageResponse)
 def create_team(
     team: TeamCreate,
     db: Session = Depends(get_db),
@@ -64,7 +81,7 @@ def create_team(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 # For Admin delete a team
-@router.delete("/team/delete")
+@router.delete("/team/delete", response_model=MessageResponse)
 def delete_team(
     team_id: int,
     db: Session = Depends(get_db),
@@ -82,7 +99,7 @@ def delete_team(
 
  
 # For Admin add a new team member
-@router.post("/team")
+@router.post("/team", response_model=MessageResponse)
 def add_team_member(
     userTeam: UserTeamAdd,
     db: Session = Depends(get_db),
@@ -102,7 +119,7 @@ def add_team_member(
 
 
 # For Admin delete a team member
-@router.delete("/team")
+@router.delete("/team", response_model=MessageResponse)
 def delete_team_member(
     user_id: int,
     team_id: int,
@@ -120,9 +137,9 @@ def delete_team_member(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 # For Manager get team expenses
-@router.get("/team/expenses")
+@router.get("/team/expenses", response_model=dict[int, TeamMemberSpendings])
 def get_team_expenses(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)
 ):
     try:
         return repo.get_team_expenses(db, current_user)
@@ -134,9 +151,9 @@ def get_team_expenses(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
 
 # For Manager get team expenses by category
-@router.get("/team/expenses/by-category")
+@router.get("/team/expenses/by-category", response_model=dict[str, float])
 def get_team_expenses_by_category(
-    db: Session = Depends(get_db), current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db), current_user: User = Depends(get_current_user)
 ):
     try:
         return repo.get_team_expenses_by_category(db, current_user)
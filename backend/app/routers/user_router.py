@@ -4,8 +4,10 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import User
 import app.repositories.user_repository as repo
+from app.schemas.common_schema import MessageResponse
 from app.schemas.user_schema import UserBase
 from app.utils.security import get_current_user
+from app.utils.serialization import list_response
 
 router = APIRouter()  
 
@@ -20,14 +22,14 @@ def get_users(
     role: Optional[str] = Query(None, description="Filter by role (e.g., 'manager', 'user')")
 ):
     try:
-        return repo.get_filtered_users(db, current_user, status, email, name_or_surname, role)
+        return list_response(UserBase, repo.get_filtered_users(db, current_user, status, email, name_or_surname, role))
     except PermissionError as e:
         raise HTTPException(status_code=403, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
 
 # Approve a user
-@router.put("/users/approve/{user_id}")
+@router.put("/users/approve/{user_id}", response_model=MessageResponse)
 def approve_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     try:
         repo.approve_user(db, user_id, current_user)
@@ -40,7 +42,7 @@ def approve_user(user_id: int, db: Session = Depends(get_db), current_user: User
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
     
 # Change user role
-@router.put("/users/change-role/{user_id}")
+@router.put("/users/change-role/{user_id}", response_model=MessageResponse)
 def change_user_role(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     try:
         repo.change_user_role(db, user_id, current_user)
@@ -55,7 +57,7 @@ def change_user_role(user_id: int, db: Session = Depends(get_db), current_user:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="An unexpected error occurred")
     
 # Delete a user
-@router.delete("/users/{user_id}")
+@router.delete("/users/{user_id}", response_model=MessageResponse)
 def delete_user(user_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     try:
         repo.delete_user(db, user_id, current_user)
@@ -5,4 +5,13 @@ class CategoryUpdate(BaseModel):
     category_name: str
 
 class CategoryCreate(BaseModel):
-    category_name: str
\ No newline at end of file
+    category_name: str
+
+class CategoryDisplay(BaseModel):
+    id: int
+    name: str
+
+class CategoryAdminView(BaseModel):
+    id: int
+    name: str
+    expense_count: int
@@ -1,7 +1,7 @@
 from datetime import date
 import datetime
 from typing import Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 class ExpenseBase(BaseModel):
     id: int
@@ -35,4 +35,68 @@ class ExpenseUpdate(BaseModel):
     name: Optional[str] = None
     amount: Optional[float] = None
     date: Optional[datetime.date] = None
-    category_id: Optional[int] = None
\ No newline at end of file
+    category_id: Optional[int] = None
+
+class ExpensePage(BaseModel):
+    items: list[ExpenseList]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+
+class ExpenseImportRow(BaseModel):
+    name: str = Field(min_length=1, max_length=50)
+    amount: float = Field(ge=0)
+    date: date
+    category: Optional[str] = None
+
+class ExpenseImportError(BaseModel):
+    row: int
+    error: str
+
+class ExpenseImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ExpenseImportError]
+
+class ExpenseFilter(BaseModel):
+    expense_name: Optional[str] = None
+    expense_amount: Optional[float] = None
+    expense_category: Optional[int] = None
+    expense_date: Optional[datetime.date] = None
+    start_date: Optional[datetime.date] = None
+    end_date: Optional[datetime.date] = None
+    expression: Optional[dict] = None
+
+class ExpenseBulkUpdate(BaseModel):
+    ids: Optional[list[int]] = None
+    filter: Optional[ExpenseFilter] = None
+    patch: ExpenseUpdate
+
+class ExpenseBulkDelete(BaseModel):
+    ids: Optional[list[int]] = None
+    filter: Optional[ExpenseFilter] = None
+
+class ExpenseBulkUpdateResult(BaseModel):
+    updated: int
+
+class ExpenseBulkDeleteResult(BaseModel):
+    deleted: int
+
+class TotalSpendings(BaseModel):
+    week: float
+    month: float
+    year: float
+    total: float
+
+class YearlyComparison(BaseModel):
+    current_year: dict[int, float]
+    last_year: dict[int, float]
+
+class DashboardStatistics(BaseModel):
+    total_spendings: TotalSpendings
+    yearly_comparison: YearlyComparison
+    category_spendings: dict[str, float]
+
+class SpendingBucket(BaseModel):
+    period: datetime.date
+    total: float
+    count: int
@@ -0,0 +1,22 @@
+from typing import Optional
+from pydantic import BaseModel
+
+class PoolStatus(BaseModel):
+    size: int
+    checked_out: int
+    overflow: int
+    capacity: Optional[int] = None
+    saturation: Optional[float] = None
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds_total: float = 0
+    wait_seconds_max: float = 0
+
+class PasswordHasherStatus(BaseModel):
+    workers: int
+    max_pending: int
+    pending: int
+    completed: int
+    rejected: int
+    latency_seconds_total: float
+    latency_seconds_max: float
@@ -1,4 +1,32 @@
+from typing import Optional
 from pydantic import BaseModel
 
 class TeamCreate(BaseModel):
-    team_name: str
\ No newline at end of file
+    team_name: str
+
+class TeamDisplay(BaseModel):
+    id: int
+    name: str
+    manager_id: Optional[int] = None
+
+class TeamMember(BaseModel):
+    id: int
+    name: str
+    surname: str
+    email: str
+    role: Optional[str] = None
+
+class TeamInfo(BaseModel):
+    team: TeamDisplay
+    manager: Optional[TeamMember] = None
+    users: list[TeamMember]
+
+class TeamPage(BaseModel):
+    items: list[TeamInfo]
+    next_cursor: Optional[str] = None
+
+class TeamMemberSpendings(BaseModel):
+    name: str
+    surname: str
+    total_spendings: float
+    spendings_by_category: dict[str, float]
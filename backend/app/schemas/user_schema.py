@@ -34,4 +34,21 @@ class UserDisplay(BaseModel):
 
 class UserTeamAdd(BaseModel):
     user_id: int
-    team_id: int
\ No newline at end of file
+    team_id: int
+
+class LoginResponse(BaseModel):
+    access_token: str
+    role: str
+    token_type: str
+    message: str
+
+class TokenStatus(BaseModel):
+    role: str
+    is_approved: bool
+
+class RefreshedToken(BaseModel):
+    access_token: str
+    token_type: str
+
+class ResetPasswordResponse(BaseModel):
+    password: str
@@ -0,0 +1,33 @@
+import hashlib
+from datetime import date
+from fastapi import Depends, HTTPException, Request, Response, status
+from app.models import User
+from app.utils.read_routing import get_current_data_state_async
+from app.utils.security import get_current_user_async
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+# Answers 304 before any query runs when the client already holds the current
+# representation. The ETag covers the user's data version, the catalog version
+# (category names), the URL and today's date, because the week/month/year
+# windows move without any write.
+async def expense_etag(
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user_async),
+    data_state=Depends(get_current_data_state_async),
+) -> dict:
+    key = f"{current_user.id}:{data_state.data_version}:{data_state.catalog_version}:{date.today().isoformat()}:{request.url.path}?{request.url.query}"
+    headers = {
+        "ETag": f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"',
+        "Cache-Control": "private, no-cache",
+    }
+    if _etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return headers
@@ -0,0 +1,90 @@
+import json
+from datetime import date
+from sqlalchemy import and_, not_, or_
+from app.models import Expense
+from app.utils.search import matches
+
+# A filter is a JSON tree of conditions and groups, for example
+#   {"and": [{"field": "date", "op": "between", "value": ["2024-01-01", "2024-03-31"]},
+#            {"or": [{"field": "category", "op": "in", "value": [2, 5]},
+#                    {"not": {"field": "amount", "op": "lt", "value": 100}}]}]}
+FIELDS = {
+    "name": (Expense.name, str),
+    "amount": (Expense.amount, float),
+    "date": (Expense.date, date.fromisoformat),
+    "category": (Expense.category_id, int),
+}
+COMPARISONS = {
+    "eq": lambda column, value: column == value,
+    "ne": lambda column, value: column != value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+}
+MAX_FILTER_NODES = 100
+COMBINATORS = ("and", "or", "not")
+
+
+def parse_filter(raw: str) -> dict:
+    try:
+        expression = json.loads(raw)
+    except json.JSONDecodeError:
+        raise ValueError("Filter is not valid JSON")
+    if not isinstance(expression, dict):
+        raise ValueError("Filter must be a JSON object")
+    return expression
+
+
+def compile_filter(expression: dict):
+    nodes = [0]
+
+    def compile_node(node):
+        nodes[0] += 1
+        if nodes[0] > MAX_FILTER_NODES:
+            raise ValueError("Filter is too large")
+        if not isinstance(node, dict):
+            raise ValueError("Filter node must be an object")
+        # A node is exactly one group or one condition; anything else would
+        # silently drop part of what the client asked for
+        combinators = [key for key in COMBINATORS if key in node]
+        if len(combinators) > 1 or (combinators and len(node) > 1):
+            raise ValueError("Filter node must have exactly one of 'and', 'or', 'not' or a condition")
+
+        if "and" in node or "or" in node:
+            group = node.get("and", node.get("or"))
+            if not isinstance(group, list) or not group:
+                raise ValueError("Filter group must be a non-empty list")
+            combine = and_ if "and" in node else or_
+            return combine(*[compile_node(child) for child in group])
+        if "not" in node:
+            return not_(compile_node(node["not"]))
+        return compile_condition(node)
+
+    return compile_node(expression)
+
+
+def compile_condition(node: dict):
+    if node.get("field") not in FIELDS:
+        raise ValueError(f"Unknown filter field: {node.get('field')}")
+    column, convert = FIELDS[node["field"]]
+    op = node.get("op", "eq")
+    value = node.get("value")
+
+    try:
+        if op in COMPARISONS:
+            return COMPARISONS[op](column, convert(value))
+        if op == "in":
+            if not isinstance(value, list) or not value:
+                raise ValueError("'in' needs a non-empty list")
+            return column.in_([convert(item) for item in value])
+        if op == "between":
+            if not isinstance(value, list) or len(value) != 2:
+                raise ValueError("'between' needs a [low, high] pair")
+            return column.between(convert(value[0]), convert(value[1]))
+        if op == "contains" and node["field"] == "name":
+            return matches([column], str(value))
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid value for {node['field']}: {e}")
+
+    raise ValueError(f"Unsupported operator {op} for {node['field']}")
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from datetime import date
+from typing import BinaryIO, Iterable, Iterator
+
+IMPORT_FORMATS = ("csv", "ndjson")
+EXPORT_FORMATS = ("csv", "ndjson")
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def detect_format(filename: str, content_type: str) -> str:
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    raise ValueError("Unsupported file format, expected CSV or NDJSON")
+
+
+def iter_rows(stream: BinaryIO, file_format: str) -> Iterator[tuple[int, dict]]:
+    # Yields (line number, raw row) lazily so uploads are never fully loaded in memory
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            yield line_number, None
+            continue
+        yield line_number, row if isinstance(row, dict) else None
+
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def write_rows(rows: Iterable, columns: list[str], file_format: str, batch_size: int) -> Iterator[str]:
+    # Emits one chunk per batch_size rows, so the response is written while
+    # the database cursor is still being read.
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if file_format == "csv" else None
+    if writer:
+        writer.writerow(columns)
+
+    pending = 0
+    for row in rows:
+        if writer:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps({column: _json_value(value) for column, value in zip(columns, row)}))
+            buffer.write("\n")
+        pending += 1
+        if pending >= batch_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+
+    if buffer.tell():
+        yield buffer.getvalue()
@@ -1,10 +1,13 @@
+from datetime import date
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from app.schemas.user_schema import UserRegister
 from app.models import Expense, Category, Team, User
 from app.repositories.user_repository import get_user_by_email
 from app.repositories.category_repository import get_category_by_name
 from app.repositories.auth_repository import create_user
-from random import randint, choice
+from app.repositories.spending_rollup_repository import add_expense_rows
+from random import Random
 
 
 def category_dump(db: Session):
@@ -19,43 +22,44 @@ def category_dump(db: Session):
     db.commit()
 
 
-def initial_users(db: Session):
-    users = []
-
-    # Create main users
-    main_users = [
-        {"name": "user", "surname": "user", "email": "user@user.com", "password": "user", "role": "user", "is_approved": True},
-        {"name": "manager", "surname": "manager", "email": "manager@manager.com", "password": "manager", "role": "manager", "is_approved": True},
-        {"name": "admin", "surname": "admin", "email": "admin@admin.com", "password": "admin", "role": "admin", "is_approved": True},
+# Demo accounts; seeding only ever creates these and leaves registered users alone
+def demo_accounts() -> list[dict]:
+    accounts = [
+        {"name": "user", "surname": "user", "email": "user@user.com", "password": "user", "role": "user"},
+        {"name": "manager", "surname": "manager", "email": "manager@manager.com", "password": "manager", "role": "manager"},
+        {"name": "admin", "surname": "admin", "email": "admin@admin.com", "password": "admin", "role": "admin"},
     ]
-    users.extend(main_users)
-
-    # Generate additional users
     for i in range(1, 51):
-        users.append({
+        accounts.append({
             "name": f"user{i}",
             "surname": f"surname{i}",
             "email": f"user{i}@example.com",
             "password": f"password{i}",
             "role": "user",
-            "is_approved": True,
         })
-
-    for user_data in users:
-        user_reg = UserRegister(
-            name=user_data["name"],
-            surname=user_data["surname"],
-            email=user_data["email"],
-            password=user_data["password"]
-        )
-        if not get_user_by_email(db, user_reg.email):
-            create_user(db, user_reg)
-
-        db_user = get_user_by_email(db, user_reg.email)
-        db_user.role = user_data["role"]
-        db_user.is_approved = user_data["is_approved"]
+    return accounts
+
+
+# Creates the demo accounts that do not exist yet and returns them; existing
+# accounts keep whatever role and approval they have been given since
+def initial_users(db: Session) -> list[User]:
+    created = []
+    for account in demo_accounts():
+        if get_user_by_email(db, account["email"]):
+            continue
+        create_user(db, UserRegister(
+            name=account["name"],
+            surname=account["surname"],
+            email=account["email"],
+            password=account["password"],
+        ))
+        db_user = get_user_by_email(db, account["email"])
+        db_user.role = account["role"]
+        db_user.is_approved = True
+        created.append(db_user)
 
     db.commit()
+    return created
 
 
 def team_dump(db: Session):
@@ -68,31 +72,43 @@ def team_dump(db: Session):
     db.commit()
 
 
-def user_expense_dump(db: Session):
+# Gives each of the given users 10-30 expenses and adds them to the monthly
+# rollup incrementally, so existing rollup rows are left as they are
+def user_expense_dump(db: Session, users: list[User]):
     categories = {cat.name: cat for cat in db.query(Category).all()}
-    all_users = db.query(User).all()
 
     expenses_names = ["Groceries", "Restaurant", "Internet Bill", "Electricity", "Movie", "Gym", "Train Ticket",
                       "Vacation", "Books", "Clothes", "Apartment Rent", "Health Insurance", "Netflix", "Spotify",
                       "Birthday Gift", "Donation", "Pet Food", "Football Tickets"]
 
-    for user in all_users:
-        user_expense_count = randint(10, 30)
+    rows = []
+    for user in users:
+        if user.role == "admin":
+            continue
+        # Seeded per user so every database gets the same demo data
+        rng = Random(user.id)
+        user_expense_count = rng.randint(10, 30)
         for _ in range(user_expense_count):
-            expense = Expense(
-                name=choice(expenses_names),
-                amount=randint(10, 500),
-                date=f"2024-{randint(1,12):02}-{randint(1,28):02}",
-                category_id=categories[choice(list(categories.keys()))].id,
-                user_id=user.id,
-            )
-            db.add(expense)
-
+            rows.append({
+                "name": rng.choice(expenses_names),
+                "amount": rng.randint(10, 500),
+                "date": date(2024, rng.randint(1, 12), rng.randint(1, 28)),
+                "category_id": categories[rng.choice(list(categories.keys()))].id,
+                "user_id": user.id,
+            })
+
+    if rows:
+        db.execute(insert(Expense), rows)
+        add_expense_rows(db, rows)
     db.commit()
 
 
-def full_dump(db: Session):
+# Returns False without touching anything when every demo account already exists
+def full_dump(db: Session) -> bool:
     category_dump(db)
-    initial_users(db)
+    users = initial_users(db)
+    if not users:
+        return False
     team_dump(db)
-    user_expense_dump(db)
+    user_expense_dump(db, users)
+    return True
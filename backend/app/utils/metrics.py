@@ -0,0 +1,98 @@
+import time
+from prometheus_client import CollectorRegistry, Counter, Histogram, disable_created_metrics
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.process_collector import ProcessCollector
+from app import database
+from app.utils.password_hasher import hash_seconds, password_hasher
+from app.utils.pool_stats import pool_status
+
+# Per worker process, like the admin monitoring endpoints
+registry = CollectorRegistry()
+# Drops the *_created series, which double the output for no use here
+disable_created_metrics()
+
+requests_total = Counter(
+    "http_requests",
+    "Requests handled, by route template and response status",
+    ["method", "route", "status"],
+    registry=registry,
+)
+request_seconds = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10),
+    registry=registry,
+)
+registry.register(hash_seconds)
+ProcessCollector(registry=registry)
+
+
+# Pool and hasher state is read when Prometheus scrapes rather than kept in
+# metrics that every checkout or job would have to update
+class _StateCollector:
+    def collect(self):
+        pools = {name: pool_status(engine) for name, engine in database.pool_engines().items()}
+        gauges = {
+            "size": "Connections the pool keeps open",
+            "checked_out": "Connections currently in use",
+            "overflow": "Connections open beyond the pool size",
+            "capacity": "Most connections the pool will open",
+        }
+        for key, documentation in gauges.items():
+            metric = GaugeMetricFamily(f"db_pool_{key}", documentation, labels=["pool"])
+            for name, status in pools.items():
+                if status.get(key) is not None:
+                    metric.add_metric([name], status[key])
+            yield metric
+        counters = {
+            "checkouts": "Connections handed out",
+            "timeouts": "Checkouts that gave up waiting for a connection",
+            "wait_seconds": "Time spent waiting for a connection",
+        }
+        for key, documentation in counters.items():
+            metric = CounterMetricFamily(f"db_pool_{key}", documentation, labels=["pool"])
+            for name, status in pools.items():
+                metric.add_metric([name], status.get("wait_seconds_total" if key == "wait_seconds" else key, 0))
+            yield metric
+
+        hasher = password_hasher.status()
+        yield GaugeMetricFamily(
+            "password_hash_pending", "Hash jobs queued or running", value=hasher["pending"]
+        )
+        yield CounterMetricFamily(
+            "password_hash_rejected", "Hash jobs refused because the queue was full", value=hasher["rejected"]
+        )
+
+
+registry.register(_StateCollector())
+
+
+# Records every HTTP request under its route template (`/api/expenses/{expense_id}`,
+# not the concrete path) so label cardinality stays bounded. Unhandled errors
+# are counted as 500s, which is what the client receives.
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            route = route.path if route is not None else "unmatched"
+            requests_total.labels(scope["method"], route, str(status)).inc()
+            request_seconds.labels(scope["method"], route).observe(time.perf_counter() - started)
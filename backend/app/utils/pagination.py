@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import date
+
+
+def encode_cursor(sort_by: str, sort_order: str, value, last_id: int, direction: str) -> str:
+    if isinstance(value, date):
+        value = value.isoformat()
+    payload = {"s": sort_by, "o": sort_order, "v": value, "i": last_id, "d": direction}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return {
+            "sort_by": payload["s"],
+            "sort_order": payload["o"],
+            "value": payload["v"],
+            "id": int(payload["i"]),
+            "direction": payload["d"],
+        }
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
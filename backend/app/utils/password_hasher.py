@@ -0,0 +1,116 @@
+import asyncio
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Optional
+from passlib.context import CryptContext
+from prometheus_client import Histogram
+from app.core.config import settings
+
+# Hashes at another cost are upgraded by verify_and_update on the next login
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS
+)
+
+
+class PasswordHasherBusy(RuntimeError):
+    pass
+
+
+# Queue wait plus bcrypt time per job; registered with the /metrics registry
+# by app.utils.metrics
+hash_seconds = Histogram(
+    "password_hash_duration_seconds",
+    "Time from submitting a password hash or verification to its result",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 1.5, 2.5, 5),
+    registry=None,
+)
+
+
+# Run in the worker processes
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify_and_update(password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+# bcrypt is CPU bound and holds the GIL long enough to stall other requests,
+# so the API hashes in a small process pool. At most max_pending jobs may be
+# queued or running; beyond that callers get PasswordHasherBusy right away
+# instead of piling up behind a login burst.
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pool = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that holds DB connections and threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    def _submit(self, operation: str, fn, *args) -> Future:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHasherBusy("Too many password operations in progress")
+            self.pending += 1
+            executor = self._executor()
+        started = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except Exception:
+            self._finished(operation, started)
+            raise
+        future.add_done_callback(lambda _: self._finished(operation, started))
+        return future
+
+    def _finished(self, operation: str, started: float):
+        elapsed = time.perf_counter() - started
+        hash_seconds.labels(operation).observe(elapsed)
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self.latency_total += elapsed
+            self.latency_max = max(self.latency_max, elapsed)
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit("hash", _hash, password))
+
+    # Returns (valid, new_hash); new_hash is set when the stored hash should be replaced
+    async def verify_and_update(self, password: str, password_hash: str) -> tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(self._submit("verify", _verify_and_update, password, password_hash))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "latency_seconds_total": self.latency_total,
+                "latency_seconds_max": self.latency_max,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING)
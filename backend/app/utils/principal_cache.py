@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from app.core.config import settings
+
+
+# The fields routes and repositories read from current_user; a detached copy,
+# so it can outlive the session it was loaded in
+@dataclass(frozen=True)
+class Principal:
+    id: int
+    name: str
+    surname: str
+    email: str
+    role: Optional[str]
+    team_id: Optional[int]
+    is_approved: bool
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            id=user.id,
+            name=user.name,
+            surname=user.surname,
+            email=user.email,
+            role=user.role,
+            team_id=user.team_id,
+            is_approved=user.is_approved,
+        )
+
+
+# Per-process LRU of principals keyed by token subject. Repositories invalidate
+# entries after changing a user; other workers pick the change up within the TTL.
+class PrincipalCache:
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[subject]
+                return None
+            self._entries.move_to_end(subject)
+            return principal
+
+    def put(self, subject: str, principal: Principal) -> Principal:
+        if self.ttl <= 0:
+            return principal
+        with self._lock:
+            self._entries[subject] = (principal, time.monotonic() + self.ttl)
+            self._entries.move_to_end(subject)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return principal
+
+    def invalidate_users(self, user_ids) -> None:
+        user_ids = set(user_ids)
+        with self._lock:
+            for subject in [
+                subject for subject, (principal, _) in self._entries.items() if principal.id in user_ids
+            ]:
+                del self._entries[subject]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_TTL, settings.PRINCIPAL_CACHE_SIZE)
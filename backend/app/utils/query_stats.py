@@ -0,0 +1,124 @@
+import re
+import time
+import warnings
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from app.core.config import settings
+
+
+class RepeatedQueryWarning(UserWarning):
+    pass
+
+
+class RepeatedQueryError(RuntimeError):
+    pass
+
+
+# Bind parameters of an expanded IN list, for psycopg2 and asyncpg
+_IN_LIST = re.compile(r"\(\s*(?:%\(\w+\)s|\$\d+)(?:\s*,\s*(?:%\(\w+\)s|\$\d+))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("(?)", statement)).strip()
+
+
+class RequestQueries:
+    __slots__ = ("request", "count", "seconds", "statements")
+
+    def __init__(self, request: str = None):
+        # "METHOD /path", for logs about this request's statements
+        self.request = request
+        self.count = 0
+        self.seconds = 0.0
+        # Keyed by the raw SQL, whose hash Python caches, so recording stays
+        # cheap; shapes are only worked out when the request is checked
+        self.statements = Counter()
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    # Statement shapes that ran more than `limit` times, most frequent first
+    def repeated(self, limit: int) -> list[tuple[str, int]]:
+        shapes = Counter()
+        for statement, count in self.statements.items():
+            shapes[statement_shape(statement)] += count
+        return [(shape, count) for shape, count in shapes.most_common() if count > limit]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.2f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+# Registered on the Engine class, so every sync engine and the sync side of
+# every async engine reports to whichever request is running the statement.
+# The start time is kept on the execution context rather than the connection,
+# so a statement that raises cannot skew the timing of the next one.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None and context is not None:
+        context.query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _current.get()
+    started = getattr(context, "query_started", None)
+    if queries is not None and started is not None:
+        queries.record(statement, time.perf_counter() - started)
+
+
+def check_repeated_queries(queries: RequestQueries, path: str):
+    if settings.QUERY_REPEAT_CHECK not in ("warn", "error"):
+        return
+    repeated = queries.repeated(settings.QUERY_REPEAT_LIMIT)
+    if not repeated:
+        return
+    shape, count = repeated[0]
+    message = (
+        f"{path} ran the same statement {count} times (limit {settings.QUERY_REPEAT_LIMIT}),"
+        f" likely an N+1 query: {shape}"
+    )
+    if settings.QUERY_REPEAT_CHECK == "error":
+        raise RepeatedQueryError(message)
+    warnings.warn(message, RepeatedQueryWarning)
+
+
+# Counts the statements each request issues and their database time, reports
+# them in a Server-Timing header and checks them for repeated statements.
+# Statements run while a streaming body is sent come after the header and are
+# left out.
+class QueryStatsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(f"{scope['method']} {scope['path']}")
+        token = _current.set(queries)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                check_repeated_queries(queries, scope["path"])
+                MutableHeaders(scope=message).append("Server-Timing", queries.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
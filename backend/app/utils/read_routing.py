@@ -0,0 +1,62 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app import database
+from app.models import User
+from app.repositories.user_repository import get_data_state
+from app.utils.security import credentials_exception, get_current_user, get_current_user_async
+
+
+# data_version and data_changed_at of the current user, read from the primary
+def get_current_data_state(
+    db: Session = Depends(database.get_db), current_user: User = Depends(get_current_user)
+):
+    state = get_data_state(db, current_user.id)
+    if state is None:
+        raise credentials_exception
+    return state
+
+
+async def get_current_data_state_async(
+    db: AsyncSession = Depends(database.get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    state = await db.run_sync(get_data_state, current_user.id)
+    if state is None:
+        raise credentials_exception
+    return state
+
+
+# Sessions for read-only routes; see database.read_session_factory. On the
+# primary they reuse the request's session, which is already checked out for
+# the data state, so a read route never holds two primary connections.
+def get_read_db(
+    data_state=Depends(get_current_data_state), primary_db: Session = Depends(database.get_db)
+):
+    session_factory = database.read_session_factory(data_state.data_changed_at)
+    if session_factory is None:
+        raise RuntimeError("Database connection is not available.")
+    if session_factory is database.SessionLocal:
+        yield primary_db
+        return
+
+    db = session_factory()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    data_state=Depends(get_current_data_state_async),
+    primary_db: AsyncSession = Depends(database.get_async_db),
+):
+    session_factory = database.read_session_factory(data_state.data_changed_at, asynchronous=True)
+    if session_factory is None:
+        raise RuntimeError("Database connection is not available.")
+    if session_factory is database.AsyncSessionLocal:
+        yield primary_db
+        return
+
+    async with session_factory() as db:
+        yield db
@@ -0,0 +1,38 @@
+from sqlalchemy import case, func, or_, text
+from sqlalchemy.orm import Session
+
+# pg_trgm availability per engine, looked up once per process
+_trigram_support = {}
+
+
+def has_trigram_support(db: Session) -> bool:
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return False
+    if bind not in _trigram_support:
+        _trigram_support[bind] = (
+            db.execute(text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")).first()
+            is not None
+        )
+    return _trigram_support[bind]
+
+
+def _escape(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def matches(columns: list, term: str):
+    # Case-insensitive substring match; on Postgres the ILIKE '%term%' is served
+    # by the gin_trgm_ops indexes from migration 3, elsewhere it is a plain scan.
+    pattern = f"%{_escape(term)}%"
+    return or_(*[column.ilike(pattern, escape="\\") for column in columns])
+
+
+def relevance(db: Session, columns: list, term: str):
+    # Ordering expression, best match first
+    if has_trigram_support(db):
+        return func.greatest(*[func.similarity(column, term) for column in columns]).desc()
+    prefix = f"{_escape(term)}%"
+    return case(
+        (or_(*[column.ilike(prefix, escape="\\") for column in columns]), 0), else_=1
+    ).asc()
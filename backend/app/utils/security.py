@@ -1,40 +1,54 @@
-from multiprocessing.resource_tracker import getfd
-from passlib.context import CryptContext
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.utils.jwt_handler import decode_access_token
 from jose import JWTError
 from app.repositories.user_repository import get_user_by_email
+from app.utils.password_hasher import pwd_context
+from app.utils.principal_cache import Principal, principal_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Inline hashing for scripts and tests; API routes use password_hasher
 def get_hashed_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
-    credentials_exception = HTTPException(
-        status_code=401,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+credentials_exception = HTTPException(
+    status_code=401,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+def _token_email(token: str) -> str:
     try:
         payload = decode_access_token(token)
-        if not payload:
-            raise credentials_exception
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        
-        user = get_user_by_email(db, email)
-        if user is None:
-            raise credentials_exception
-
-        return user
     except JWTError:
-        raise credentials_exception
\ No newline at end of file
+        raise credentials_exception
+    if not payload or payload.get("sub") is None:
+        raise credentials_exception
+    return payload["sub"]
+
+def _cache_principal(email: str, user) -> Principal:
+    if user is None:
+        raise credentials_exception
+    return principal_cache.put(email, Principal.from_user(user))
+
+# Sessions connect lazily, so a cache hit costs no database round trip
+def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)):
+    email = _token_email(token)
+    return principal_cache.get(email) or _cache_principal(email, get_user_by_email(db, email))
+
+# Same as get_current_user, for async routes
+async def get_current_user_async(
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
+):
+    email = _token_email(token)
+    principal = principal_cache.get(email)
+    if principal is None:
+        principal = _cache_principal(email, await db.run_sync(get_user_by_email, email))
+    return principal
\ No newline at end of file
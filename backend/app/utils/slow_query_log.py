@@ -0,0 +1,144 @@
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from logging.handlers import WatchedFileHandler
+import orjson
+from sqlalchemy import Select, event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.utils.query_stats import current_queries
+
+_logger = logging.getLogger("app.slow_queries")
+_logger.setLevel(logging.INFO)
+_logger.propagate = False
+_handler_lock = threading.Lock()
+_handler = None
+
+# Values that identify rows without exposing what users typed; strings and
+# anything else are replaced by their type
+_KEPT_TYPES = (int, float, Decimal, date, type(None))
+_SKIPPED_MODULES = ("sqlalchemy.", "app.utils.slow_query_log", "app.utils.query_stats", "app.database")
+
+
+def _redact(value):
+    if isinstance(value, _KEPT_TYPES):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_redact(item) for item in value]
+    return f"<redacted {type(value).__name__}>"
+
+
+def redact_parameters(parameters, executemany: bool = False):
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "first": redact_parameters(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {key: _redact(value) for key, value in parameters.items()}
+    return _redact(parameters)
+
+
+# The innermost repository function on the stack, else the innermost frame
+# outside SQLAlchemy and the database plumbing, as "module:function:line"
+def calling_function() -> str:
+    frame = sys._getframe(1)
+    fallback = None
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("app.repositories."):
+            return f"{module}:{frame.f_code.co_name}:{frame.f_lineno}"
+        if fallback is None and not module.startswith(_SKIPPED_MODULES):
+            fallback = f"{module}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return fallback
+
+
+# Runs inside a savepoint so a failure cannot abort the caller's transaction. The plan comes from a fresh cursor on the same connection,
+# leaving the original cursor's results untouched.
+def _explain(conn, statement: str, parameters) -> dict:
+    dbapi_connection = conn.connection.dbapi_connection
+    savepoint = not getattr(dbapi_connection, "autocommit", False)
+    cursor = dbapi_connection.cursor()
+    try:
+        if savepoint:
+            cursor.execute("SAVEPOINT slow_query_explain")
+        try:
+            cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0]
+        except Exception as error:
+            if savepoint:
+                cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+            return {"explain_error": str(error)}
+        if savepoint:
+            cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+    finally:
+        cursor.close()
+    # psycopg2 decodes the JSON plan, asyncpg returns it as text
+    return {"plan": orjson.loads(plan) if isinstance(plan, str) else plan}
+
+
+# EXPLAIN ANALYZE runs the statement a second time, so only compiled SELECTs
+# that read from something are explained: never text() or FOR UPDATE, and never
+# a bare "SELECT f(...)" such as pg_advisory_lock, whose side effects (a session
+# lock) a savepoint rollback does not undo
+def _explainable(context, executemany: bool) -> bool:
+    if executemany or context is None or context.compiled is None:
+        return False
+    statement = context.compiled.statement
+    return (
+        isinstance(statement, Select)
+        and statement._for_update_arg is None
+        and bool(statement.get_final_froms())
+    )
+
+
+def _write(entry: dict):
+    global _handler
+    path = os.path.abspath(settings.SLOW_QUERY_LOG_FILE)
+    with _handler_lock:
+        if _handler is None or _handler.baseFilename != path:
+            if _handler is not None:
+                _logger.removeHandler(_handler)
+                _handler.close()
+            # Reopens the file when logrotate moves it away
+            _handler = WatchedFileHandler(path)
+            _logger.addHandler(_handler)
+    _logger.info(orjson.dumps(entry, default=str).decode())
+
+
+# The start time lives on the statement's execution context, so a statement
+# that raises leaves nothing behind on the pooled connection
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if settings.SLOW_QUERY_THRESHOLD_MS > 0 and context is not None:
+        context.slow_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "slow_query_started", None)
+    if started is None:
+        return
+    duration_ms = (time.perf_counter() - started) * 1000
+    if settings.SLOW_QUERY_THRESHOLD_MS <= 0 or duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+        return
+
+    request = current_queries()
+    url = conn.engine.url
+    entry = {
+        "time": datetime.now(timezone.utc).isoformat(),
+        "duration_ms": round(duration_ms, 3),
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "database": f"{url.host}/{url.database}",
+        "request": request.request if request is not None else None,
+        "caller": calling_function(),
+        "statement": statement,
+        "parameters": redact_parameters(parameters, executemany),
+    }
+    if _explainable(context, executemany) and random.random() < settings.SLOW_QUERY_EXPLAIN_RATE:
+        entry.update(_explain(conn, statement, parameters))
+    _write(entry)
@@ -0,0 +1,187 @@
+import io
+import math
+import time
+from functools import lru_cache
+from itertools import accumulate
+from calendar import monthrange
+from datetime import date
+from random import Random
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+from app.models import Category, Team, User
+from app.repositories.spending_rollup_repository import rebuild_monthly_spendings
+from app.utils.init import category_dump
+from app.utils.security import get_hashed_password
+
+SYNTHETIC_PASSWORD = "password"
+
+# (name, category, median amount, chance a user has it); one expense per month
+RECURRING = [
+    ("Apartment Rent", "Rent", 1200, 0.7),
+    ("Electricity", "Utilities", 70, 0.9),
+    ("Internet Bill", "Utilities", 40, 0.8),
+    ("Health Insurance", "Insurance", 150, 0.5),
+    ("Netflix", "Subscriptions", 15, 0.5),
+    ("Spotify", "Subscriptions", 10, 0.4),
+    ("Gym", "Sports", 45, 0.3),
+]
+
+# Monthly multipliers, January first
+FLAT = (1,) * 12
+WINTER = (1.6, 1.5, 1.2, 1, 0.8, 0.7, 0.7, 0.7, 0.8, 1, 1.3, 1.6)
+SUMMER = (0.3, 0.3, 0.5, 0.7, 1, 2, 3, 3, 1, 0.5, 0.3, 0.6)
+HOLIDAYS = (0.6, 0.6, 0.7, 0.8, 0.9, 0.8, 0.8, 0.8, 0.9, 1, 1.8, 3.5)
+
+# (name, category, median amount, relative frequency, seasonality)
+DISCRETIONARY = [
+    ("Groceries", "Food", 60, 30, FLAT),
+    ("Restaurant", "Food", 35, 12, FLAT),
+    ("Train Ticket", "Transport", 15, 10, FLAT),
+    ("Movie", "Entertainment", 14, 4, WINTER),
+    ("Vacation", "Travel", 700, 1, SUMMER),
+    ("Books", "Education", 25, 3, WINTER),
+    ("Clothes", "Shopping", 70, 5, HOLIDAYS),
+    ("Birthday Gift", "Gifts", 50, 2, HOLIDAYS),
+    ("Donation", "Charity", 30, 1, HOLIDAYS),
+    ("Pet Food", "Pets", 30, 3, FLAT),
+    ("Football Tickets", "Sports", 60, 1, SUMMER),
+    ("Pharmacy", "Health", 20, 3, WINTER),
+]
+
+
+def _month_start(start: date, offset: int) -> date:
+    months = start.year * 12 + start.month - 1 + offset
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def _amount(rng: Random, median: float, spread: float = 0.5) -> float:
+    # Log-normal around the median: mostly small, with a long tail
+    return round(median * math.exp(rng.gauss(0, spread)), 2)
+
+
+# Month starts of the window and the (template, month) pairs discretionary
+# expenses are drawn from, weighted by frequency times that month's seasonality
+@lru_cache
+def _calendar(start: date, months: int):
+    month_starts = [_month_start(start, offset) for offset in range(months)]
+    pairs = [(template, month) for template in DISCRETIONARY for month in month_starts]
+    cum_weights = list(accumulate(template[3] * template[4][month.month - 1] for template, month in pairs))
+    return month_starts, pairs, cum_weights
+
+
+# Expense rows of one user as COPY text lines. The user's own Random makes the
+# output depend only on (seed, user position), not on batch boundaries.
+def _user_expense_lines(rng: Random, user_id: int, count: int, start: date, months: int, categories: dict) -> list[str]:
+    month_starts, pairs, cum_weights = _calendar(start, months)
+    lines = []
+
+    for name, category, median, chance in RECURRING:
+        if rng.random() >= chance:
+            continue
+        amount = _amount(rng, median, 0.3)
+        day = rng.randint(1, 28)
+        seasonal = WINTER if category == "Utilities" else FLAT
+        for month in month_starts:
+            if len(lines) >= count:
+                return lines
+            value = amount if seasonal is FLAT else round(amount * seasonal[month.month - 1], 2)
+            lines.append(f"{name}\t{value}\t{categories[category]}\t{month.replace(day=day)}\t{user_id}\n")
+
+    for (name, category, median, _, _), month in rng.choices(pairs, cum_weights=cum_weights, k=count - len(lines)):
+        day = rng.randint(1, monthrange(month.year, month.month)[1])
+        lines.append(
+            f"{name}\t{_amount(rng, median)}\t{categories[category]}\t{month.replace(day=day)}\t{user_id}\n"
+        )
+    return lines
+
+
+def _copy_expenses(db: Session, buffer: io.StringIO):
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert("COPY expenses (name, amount, category_id, date, user_id) FROM STDIN", buffer)
+    finally:
+        cursor.close()
+
+
+def generate_dataset(
+    db: Session,
+    teams: int,
+    users_per_team: int,
+    expenses_per_user: int,
+    seed: int = 0,
+    start: date = date(2023, 1, 1),
+    months: int = 24,
+    batch_size: int = 100_000,
+    log=print,
+) -> dict:
+    prefix = f"synthetic-{seed}-"
+    if db.query(User.id).filter(User.email.startswith(prefix)).first():
+        raise ValueError(f"A dataset with seed {seed} already exists; pick another seed")
+
+    started = time.perf_counter()
+    category_dump(db)
+    categories = {name: id for id, name in db.query(Category.id, Category.name)}
+    # One hash shared by every synthetic user keeps bcrypt out of the load time
+    password_hash = get_hashed_password(SYNTHETIC_PASSWORD)
+
+    team_ids = db.execute(
+        insert(Team).returning(Team.id),
+        [{"name": f"Synthetic {seed} Team {index}"} for index in range(teams)],
+    ).scalars().all() if teams else []
+
+    # Each team gets a manager (user 0) followed by its members
+    user_rows = [
+        {
+            "name": f"Synthetic{index}",
+            "surname": f"Team{team_index}",
+            "email": f"{prefix}{team_index}-{index}@example.com",
+            "password_hash": password_hash,
+            "role": "manager" if index == 0 else "user",
+            "team_id": None if index == 0 else team_id,
+            "is_approved": True,
+        }
+        for team_index, team_id in enumerate(team_ids)
+        for index in range(users_per_team)
+    ]
+    user_ids = []
+    for offset in range(0, len(user_rows), 10_000):
+        user_ids += db.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            user_rows[offset:offset + 10_000],
+        ).scalars().all()
+    for team_index, team_id in enumerate(team_ids):
+        if users_per_team:
+            db.query(Team).filter(Team.id == team_id).update(
+                {Team.manager_id: user_ids[team_index * users_per_team]}, synchronize_session=False
+            )
+    log(f"Created {len(team_ids)} teams and {len(user_ids)} users")
+
+    buffer = io.StringIO()
+    pending = 0
+    total = 0
+    for position, user_id in enumerate(user_ids):
+        lines = _user_expense_lines(
+            Random(f"{seed}:{position}"), user_id, expenses_per_user, start, months, categories
+        )
+        buffer.writelines(lines)
+        pending += len(lines)
+        if pending >= batch_size:
+            _copy_expenses(db, buffer)
+            total += pending
+            log(f"Copied {total} expenses")
+            buffer = io.StringIO()
+            pending = 0
+    if pending:
+        _copy_expenses(db, buffer)
+        total += pending
+    db.commit()
+
+    rebuild_monthly_spendings(db)
+    db.execute(text("ANALYZE users"))
+    db.execute(text("ANALYZE expenses"))
+    db.commit()
+
+    elapsed = time.perf_counter() - started
+    log(f"Generated {total} expenses in {elapsed:.1f}s")
+    return {"teams": len(team_ids), "users": len(user_ids), "expenses": total}
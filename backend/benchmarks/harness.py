@@ -0,0 +1,121 @@
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.utils.principal_cache import Principal
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+REPEAT = int(os.getenv("BENCHMARK_REPEAT", "5"))
+# A run may take this many times its baseline time, plus a fixed allowance for
+# timer noise on very fast functions, before it counts as a regression
+TOLERANCE = float(os.getenv("BENCHMARK_TOLERANCE", "2.0"))
+NOISE_SECONDS = float(os.getenv("BENCHMARK_NOISE_SECONDS", "0.005"))
+
+# (teams, users per team, expenses per user)
+SIZES = {
+    "small": (2, 5, 20),
+    "medium": (10, 10, 200),
+    "large": (10, 20, 1000),
+}
+
+
+@dataclass
+class Dataset:
+    size: str
+    teams: int
+    team_members: int
+    users: int
+    expenses: int
+    user: Principal
+    manager: Principal
+    admin: Principal
+    team_id: int
+    teamless_user_id: int
+    expense_ids: list[int]
+    category_id: int
+
+
+@dataclass
+class Case:
+    run: Callable[[Session, Dataset], object]
+    # Most statements one call may issue; a callable budget receives the
+    # dataset, for functions whose query count grows with the data
+    budget: Union[int, Callable[[Dataset], int]]
+
+    def query_budget(self, data: Dataset) -> int:
+        return self.budget(data) if callable(self.budget) else self.budget
+
+
+@dataclass
+class Result:
+    queries: int
+    seconds: float
+    samples: list[float] = field(default_factory=list)
+
+
+# Writes go through a savepoint inside a transaction that is rolled back after
+# every call, so each repetition sees the same freshly generated dataset
+def measure(engine: Engine, case: Case, data: Dataset, repeat: int = REPEAT) -> Result:
+    samples = []
+    queries = 0
+    for iteration in range(repeat + 1):
+        statements = []
+        with engine.connect() as connection:
+            transaction = connection.begin()
+
+            def count(conn, cursor, statement, parameters, context, executemany):
+                if "SAVEPOINT" not in statement:
+                    statements.append(statement)
+
+            event.listen(connection, "before_cursor_execute", count)
+            session = Session(bind=connection, join_transaction_mode="create_savepoint")
+            try:
+                started = time.perf_counter()
+                result = case.run(session, data)
+                if hasattr(result, "__next__"):
+                    # Streaming functions do their work while being consumed
+                    for _ in result:
+                        pass
+                elapsed = time.perf_counter() - started
+            finally:
+                session.close()
+                event.remove(connection, "before_cursor_execute", count)
+                transaction.rollback()
+        # The first call warms up SQLAlchemy's statement cache
+        if iteration:
+            samples.append(elapsed)
+            queries = max(queries, len(statements))
+    return Result(queries=queries, seconds=statistics.median(samples), samples=samples)
+
+
+def load_baseline() -> dict:
+    if not BASELINE_PATH.exists():
+        return {}
+    return json.loads(BASELINE_PATH.read_text())
+
+
+def save_baseline(results: dict):
+    BASELINE_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+# Messages for every way the result falls short of its budget or baseline
+def regressions(name: str, result: Result, budget: int, baseline: dict) -> list[str]:
+    problems = []
+    if result.queries > budget:
+        problems.append(f"{name} issued {result.queries} queries, budget is {budget}")
+    if baseline:
+        if result.queries > baseline["queries"]:
+            problems.append(f"{name} issued {result.queries} queries, baseline is {baseline['queries']}")
+        allowed = baseline["seconds"] * TOLERANCE + NOISE_SECONDS
+        if result.seconds > allowed:
+            problems.append(
+                f"{name} took {result.seconds * 1000:.1f}ms, baseline is {baseline['seconds'] * 1000:.1f}ms"
+                f" (allowed {allowed * 1000:.1f}ms)"
+            )
+    return problems
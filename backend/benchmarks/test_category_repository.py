@@ -0,0 +1,35 @@
+import pytest
+import app.repositories.category_repository as repo
+from benchmarks.harness import Case
+
+CASES = {
+    "get_category_by_name": Case(
+        lambda db, data: repo.get_category_by_name(db, "Food"),
+        budget=1,
+    ),
+    "get_categories_for_admin": Case(
+        lambda db, data: repo.get_categories_for_admin(db, data.admin, True, None),
+        budget=1,
+    ),
+    "get_categories": Case(
+        lambda db, data: repo.get_categories(db, data.user),
+        budget=1,
+    ),
+    "create_category": Case(
+        lambda db, data: repo.create_category(db, "Benchmark", data.admin),
+        budget=4,
+    ),
+    "delete_category": Case(
+        lambda db, data: repo.delete_category(db, data.category_id, data.admin),
+        budget=6,
+    ),
+    "update_category": Case(
+        lambda db, data: repo.update_category(db, data.category_id, "Groceries", data.admin),
+        budget=5,
+    ),
+}
+
+# Test each category repository function against its query budget and baseline
+@pytest.mark.parametrize("name", CASES)
+def test_category_repository(benchmark, name):
+    benchmark(f"category_repository.{name}", CASES[name])
@@ -0,0 +1,116 @@
+import io
+from datetime import date
+import pytest
+import app.repositories.expenses_repository as repo
+from app.schemas.expense_schema import (
+    ExpenseBulkDelete,
+    ExpenseBulkUpdate,
+    ExpenseCreate,
+    ExpenseFilter,
+    ExpenseUpdate,
+)
+from benchmarks.harness import Case
+
+IMPORT_CSV = ("name,amount,date,category\n" + "Imported,12.5,2024-05-01,Food\n" * 100).encode()
+
+CASES = {
+    "get_expenses": Case(
+        lambda db, data: repo.get_expenses(db, data.user, None, None, None, None),
+        budget=1,
+    ),
+    "get_expenses_filtered": Case(
+        lambda db, data: repo.get_expenses(
+            db, data.user, "groceries", None, data.category_id, None, sort_by="amount", limit=100
+        ),
+        budget=1,
+    ),
+    "export_expenses": Case(
+        lambda db, data: repo.export_expenses(db, data.user, "csv", None, None, None, None, None, None),
+        budget=1,
+    ),
+    "export_team_expenses": Case(
+        lambda db, data: repo.export_expenses(
+            db, data.manager, "ndjson", None, None, None, None, None, None, team=True
+        ),
+        budget=2,
+    ),
+    "view_expense": Case(
+        lambda db, data: repo.view_expense(db, data.expense_ids[0], data.user),
+        budget=2,
+    ),
+    "create_expense": Case(
+        lambda db, data: repo.create_expense(
+            db, ExpenseCreate(name="Coffee", amount=3.5, date=date(2024, 3, 1), category_id=data.category_id), data.user
+        ),
+        budget=5,
+    ),
+    "import_expenses": Case(
+        lambda db, data: repo.import_expenses(db, data.user, io.BytesIO(IMPORT_CSV), "csv"),
+        budget=4,
+    ),
+    "update_expense": Case(
+        lambda db, data: repo.update_expense(
+            db, data.expense_ids[0], ExpenseUpdate(amount=99, date=date(2024, 6, 1)), data.user
+        ),
+        budget=8,
+    ),
+    "delete_expense": Case(
+        lambda db, data: repo.delete_expense(db, data.expense_ids[0], data.user),
+        budget=5,
+    ),
+    "bulk_update_expenses": Case(
+        lambda db, data: repo.bulk_update_expenses(
+            db,
+            ExpenseBulkUpdate(
+                filter=ExpenseFilter(expense_category=data.category_id), patch=ExpenseUpdate(name="Food")
+            ),
+            data.user,
+        ),
+        budget=6,
+    ),
+    "bulk_delete_expenses": Case(
+        lambda db, data: repo.bulk_delete_expenses(db, ExpenseBulkDelete(ids=data.expense_ids), data.user),
+        budget=4,
+    ),
+    "get_dashboard_statistics": Case(
+        lambda db, data: repo.get_dashboard_statistics(db, data.user),
+        budget=2,
+    ),
+    "get_total_spendings": Case(
+        lambda db, data: repo.get_total_spendings(db, data.user),
+        budget=2,
+    ),
+    "get_total_spendings_by_category": Case(
+        lambda db, data: repo.get_total_spendings_by_category(db, data.user, data.category_id, "year"),
+        budget=1,
+    ),
+    "get_monthly_comparison": Case(
+        lambda db, data: repo.get_monthly_comparison(db, data.user),
+        budget=2,
+    ),
+    "get_monthly_comparison_by_category": Case(
+        lambda db, data: repo.get_monthly_comparison_by_category(db, data.user, data.category_id),
+        budget=2,
+    ),
+    "get_yearly_comparison": Case(
+        lambda db, data: repo.get_yearly_comparison(db, data.user),
+        budget=1,
+    ),
+    "get_yearly_comparison_by_category": Case(
+        lambda db, data: repo.get_yearly_comparison_by_category(db, data.user, data.category_id),
+        budget=2,
+    ),
+    "get_category_spendings": Case(
+        lambda db, data: repo.get_category_spendings(db, data.user),
+        budget=1,
+    ),
+    "get_spending_series": Case(
+        lambda db, data: repo.get_spending_series(db, data.user, date(2023, 1, 1), date(2024, 12, 31), "month"),
+        budget=1,
+    ),
+}
+
+# Test each expenses repository function against its query budget and baseline
+@pytest.mark.parametrize("name", CASES)
+def test_expenses_repository(benchmark, name):
+    benchmark(f"expenses_repository.{name}", CASES[name])
@@ -0,0 +1,48 @@
+import pytest
+import app.repositories.team_repository as repo
+from benchmarks.harness import Case
+
+CASES = {
+    "get_team": Case(
+        lambda db, data: repo.get_team(db, data.manager),
+        budget=1,
+    ),
+    "create_team": Case(
+        lambda db, data: repo.create_team(db, "Benchmark Team", data.admin),
+        budget=2,
+    ),
+    "get_all_teams": Case(
+        lambda db, data: repo.get_all_teams(db, data.admin),
+        # The page of teams, then their members and managers in one query each
+        budget=3,
+    ),
+    "delete_team": Case(
+        lambda db, data: repo.delete_team(db, data.team_id, data.admin),
+        budget=4,
+    ),
+    "add_team_member": Case(
+        lambda db, data: repo.add_team_member(db, data.teamless_user_id, data.team_id, data.admin),
+        budget=4,
+    ),
+    "delete_team_member": Case(
+        lambda db, data: repo.delete_team_member(db, data.user.id, data.team_id, data.admin),
+        budget=4,
+    ),
+    "get_team_expenses": Case(
+        lambda db, data: repo.get_team_expenses(db, data.manager),
+        budget=2,
+    ),
+    "get_team_expenses_by_category": Case(
+        lambda db, data: repo.get_team_expenses_by_category(db, data.manager),
+        budget=1,
+    ),
+    "get_users_without_team": Case(
+        lambda db, data: repo.get_users_without_team(db, data.admin, None),
+        budget=1,
+    ),
+}
+
+# Test each team repository function against its query budget and baseline
+@pytest.mark.parametrize("name", CASES)
+def test_team_repository(benchmark, name):
+    benchmark(f"team_repository.{name}", CASES[name])
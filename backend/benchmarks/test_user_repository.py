@@ -0,0 +1,47 @@
+import pytest
+import app.repositories.user_repository as repo
+from benchmarks.harness import Case
+
+CASES = {
+    "get_user_by_email": Case(
+        lambda db, data: repo.get_user_by_email(db, data.user.email),
+        budget=1,
+    ),
+    "get_user_by_id": Case(
+        lambda db, data: repo.get_user_by_id(db, data.user.id),
+        budget=1,
+    ),
+    "get_data_state": Case(
+        lambda db, data: repo.get_data_state(db, data.user.id),
+        budget=1,
+    ),
+    "bump_data_version": Case(
+        lambda db, data: repo.bump_data_version(db, [data.user.id]),
+        budget=1,
+    ),
+    "get_users": Case(
+        lambda db, data: repo.get_users(db, data.admin),
+        budget=1,
+    ),
+    "get_filtered_users": Case(
+        lambda db, data: repo.get_filtered_users(db, data.admin, "approved", None, "synthetic", "user"),
+        budget=2,
+    ),
+    "approve_user": Case(
+        lambda db, data: repo.approve_user(db, data.user.id, data.admin),
+        budget=2,
+    ),
+    "change_user_role": Case(
+        lambda db, data: repo.change_user_role(db, data.manager.id, data.admin),
+        budget=3,
+    ),
+    "delete_user": Case(
+        lambda db, data: repo.delete_user(db, data.user.id, data.admin),
+        budget=2,
+    ),
+}
+
+# Test each user repository function against its query budget and baseline
+@pytest.mark.parametrize("name", CASES)
+def test_user_repository(benchmark, name):
+    benchmark(f"user_repository.{name}", CASES[name])
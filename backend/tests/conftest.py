@@ -0,0 +1,27 @@
+import pytest
+from app.cli import migrate
+from app.core.config import settings
+from app.utils.principal_cache import principal_cache
+
+
+# The app no longer touches the schema on import; bring it up to date once,
+# the same way `python -m app.cli migrate` does before a deploy
+@pytest.fixture(scope="session", autouse=True)
+def migrated_database():
+    migrate(None)
+
+
+# Fixtures truncate and recreate users under the same emails, which would
+# otherwise be served from principals cached by an earlier test
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+# Any endpoint that repeats one statement past QUERY_REPEAT_LIMIT in a request
+# fails its test instead of only warning
+@pytest.fixture(scope="session", autouse=True)
+def fail_on_repeated_queries():
+    settings.QUERY_REPEAT_CHECK = "error"
@@ -1,9 +1,10 @@
 import pytest
+from datetime import date
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 from app.main import app
-from app.models import Category, User
+from app.models import Category, Expense, MonthlySpending, User
 from app.utils.jwt_handler import create_access_token
 from app.core.config import settings
 
@@ -93,6 +94,27 @@ def test_get_categories_for_admin(valid_approved_admin_token, db_session):
     assert response.status_code == 200
     assert len(response.json()) > 0
 
+# Test that admin category counts come from one query however many categories exist
+def test_get_categories_for_admin_counts(valid_approved_admin_token, approved_user, db_session):
+    categories = [Category(name=f"Counted {index}") for index in range(15)]
+    db_session.add_all(categories)
+    db_session.commit()
+    db_session.add_all([
+        MonthlySpending(user_id=approved_user.id, category_id=categories[3].id, month=date(2024, 1, 1), total=30, count=3),
+        MonthlySpending(user_id=approved_user.id, category_id=categories[3].id, month=date(2024, 2, 1), total=10, count=2),
+        MonthlySpending(user_id=approved_user.id, category_id=categories[7].id, month=date(2024, 1, 1), total=5, count=1),
+    ])
+    db_session.commit()
+
+    response = client.get("/api/admin/categories?ascending=false", headers={"Authorization": f"Bearer {valid_approved_admin_token}"})
+    assert response.status_code == 200
+    counts = [(category["name"], category["expense_count"]) for category in response.json()]
+    assert counts[:3] == [("Counted 3", 5), ("Counted 7", 1), ("Counted 0", 0)]
+    assert len(counts) == 15
+
+    response = client.get("/api/admin/categories?ascending=true", headers={"Authorization": f"Bearer {valid_approved_admin_token}"})
+    assert [category["name"] for category in response.json()][-2:] == ["Counted 7", "Counted 3"]
+
 # Test getting categories for approved user
 def test_get_categories_for_approved_user(valid_approved_user_token, db_session):
     category = Category(name="User Category")
@@ -143,6 +165,22 @@ def test_delete_category(valid_approved_admin_token, category1):
     assert response.status_code == 200
     assert response.json()["message"] == "Category deleted"
 
+# Test that deleting a category moves its expenses and rollup to the default category
+def test_delete_category_moves_expenses(default_category, category1, valid_approved_admin_token, approved_user, db_session):
+    db_session.add_all([
+        Expense(name=f"Expense {index}", amount=10, date=date(2024, 1, 5), category_id=category1.id, user_id=approved_user.id)
+        for index in range(3)
+    ])
+    db_session.add(MonthlySpending(user_id=approved_user.id, category_id=category1.id, month=date(2024, 1, 1), total=30, count=3))
+    db_session.commit()
+
+    response = client.delete(f"/api/categories/{category1.id}", headers={"Authorization": f"Bearer {valid_approved_admin_token}"})
+    assert response.status_code == 200
+    db_session.expire_all()
+    assert {expense.category_id for expense in db_session.query(Expense)} == {default_category.id}
+    [bucket] = db_session.query(MonthlySpending).all()
+    assert (bucket.category_id, bucket.total, bucket.count) == (default_category.id, 30, 3)
+
 # Test deleting a category as user (should fail)
 def test_delete_category_as_user(valid_approved_user_token, category1):
     response = client.delete(f"/api/categories/{category1.id}", headers={"Authorization": f"Bearer {valid_approved_user_token}"})
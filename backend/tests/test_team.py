@@ -212,3 +212,141 @@ def test_add_manager_to_team_with_manager( valid_manager_token, admin_user, team
     )
     assert response.status_code == 409
     assert response.json() == {"detail": "Team already has a manager"}
+
+    app.dependency_overrides = {}
+
+# Test that team members are serialized without private fields
+def test_get_team_hides_password_hash(valid_manager_token, manager_user, team, db_session):
+    member = User(
+        name="member",
+        surname="member",
+        email="member@example.com",
+        role="user",
+        password_hash="password123",
+        is_approved=True,
+        team_id=team.id,
+    )
+    db_session.add(member)
+    manager_user.team_id = team.id
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: manager_user
+
+    response = client.get(
+        "/api/team", headers={"Authorization": f"Bearer {valid_manager_token}"}
+    )
+    assert response.status_code == 200
+    assert {user["email"] for user in response.json()} == {"manager@example.com", "member@example.com"}
+    assert all("password_hash" not in user for user in response.json())
+
+    app.dependency_overrides = {}
+
+# Test that "get all teams" pages through teams with their managers and members
+def test_get_all_teams_pages_with_members(valid_admin_token, admin_user, team, test_user, db_session):
+    test_user.team_id = team.id
+    db_session.add_all([Team(name=f"Other Team {number}") for number in range(2)])
+    db_session.commit()
+    # Loaded now so the request's query count only covers the endpoint
+    db_session.refresh(admin_user)
+
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+
+    response = client.get(
+        "/api/team/all?limit=2", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [item["team"]["name"] for item in first_page] == ["Test Team", "Other Team 0"]
+    assert first_page[0]["manager"]["email"] == "manager@example.com"
+    assert [user["email"] for user in first_page[0]["users"]] == ["test@example.com"]
+    assert first_page[1]["manager"] is None
+    # One query for the teams and one each for members and managers
+    assert 'desc="3 queries"' in response.headers["Server-Timing"]
+
+    response = client.get(
+        "/api/team/all",
+        params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]},
+        headers={"Authorization": f"Bearer {valid_admin_token}"},
+    )
+    assert response.status_code == 200
+    assert [item["team"]["name"] for item in response.json()] == ["Other Team 1"]
+    assert "X-Next-Cursor" not in response.headers
+
+    app.dependency_overrides = {}
+
+# Test filtering "get all teams" by name and rejecting bad page sizes
+def test_get_all_teams_filters_by_name(valid_admin_token, admin_user, team, db_session):
+    db_session.add(Team(name="Marketing"))
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+
+    response = client.get(
+        "/api/team/all?name=market", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert response.status_code == 200
+    assert [item["team"]["name"] for item in response.json()] == ["Marketing"]
+
+    response = client.get(
+        "/api/team/all?limit=0", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert response.status_code == 400
+
+    app.dependency_overrides = {}
+
+# Test that "users without team" leaves out team members and managers of a team, one page at a time
+def test_get_users_without_team_pages(valid_admin_token, admin_user, team, test_user, second_manager_user, db_session):
+    db_session.add_all([
+        User(
+            name=f"free{number}",
+            surname="user",
+            email=f"free{number}@example.com",
+            role="user",
+            password_hash="password123",
+            is_approved=True,
+        )
+        for number in range(2)
+    ])
+    test_user.team_id = team.id
+    db_session.commit()
+    db_session.refresh(admin_user)
+
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+
+    response = client.get(
+        "/api/team/users?limit=2", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert response.status_code == 200
+    # manager@example.com leads "Test Team" and test@example.com is in it
+    assert [user["email"] for user in response.json()] == ["manager2@example.com", "free0@example.com"]
+    assert 'desc="1 queries"' in response.headers["Server-Timing"]
+
+    response = client.get(
+        "/api/team/users?limit=2&offset=2", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert [user["email"] for user in response.json()] == ["free1@example.com"]
+
+    response = client.get(
+        "/api/team/users?offset=-1", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert response.status_code == 400
+
+    app.dependency_overrides = {}
+
+# Test that deleting a team leaves its members without a team
+def test_delete_team_releases_members(valid_admin_token, admin_user, team, test_user, db_session):
+    team_id, user_id = team.id, test_user.id
+    test_user.team_id = team_id
+    db_session.commit()
+
+    app.dependency_overrides[get_current_user] = lambda: admin_user
+
+    response = client.delete(
+        f"/api/team/delete?team_id={team_id}", headers={"Authorization": f"Bearer {valid_admin_token}"}
+    )
+    assert response.status_code == 200
+    db_session.expunge_all()
+    assert db_session.get(User, user_id).team_id is None
+    assert db_session.get(Team, team_id) is None
+
+    app.dependency_overrides = {}
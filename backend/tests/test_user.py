@@ -268,3 +268,41 @@ def test_delete_user_permission_error(db_session, mocker, current_user, valid_to
     assert response.json() == {
         "detail": "You don't have permission to delete this user"
     }
+
+
+def test_search_users_by_name_is_case_insensitive_and_ranked(db_session, admin_user, valid_token):
+    db_session.add_all([
+        User(name="Annabel", surname="Smith", email="annabel@example.com", role="user", password_hash="password123", is_approved=True),
+        User(name="Joanna", surname="Brown", email="joanna@example.com", role="user", password_hash="password123", is_approved=True),
+        User(name="Mark", surname="Lee", email="mark@example.com", role="user", password_hash="password123", is_approved=True),
+    ])
+    db_session.commit()
+
+    response = client.get(
+        "/api/users?name_or_surname=ANN", headers={"Authorization": f"Bearer {valid_token}"}
+    )
+
+    assert response.status_code == 200
+    assert [user["name"] for user in response.json()] == ["Annabel", "Joanna"]
+
+
+def test_search_users_escapes_wildcards(db_session, test_user, valid_token):
+    response = client.get(
+        "/api/users?email=%25", headers={"Authorization": f"Bearer {valid_token}"}
+    )
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+# Test that approving a user invalidates their cached principal
+def test_approve_user_refreshes_cached_principal(db_session, test_user, valid_token):
+    user_token = create_access_token({"sub": test_user.email})
+    response = client.post("/check-token", json={"token": user_token})
+    assert response.json() == {"role": "user", "is_approved": False}
+
+    response = client.put(f"/api/users/approve/{test_user.id}", headers={"Authorization": f"Bearer {valid_token}"})
+    assert response.status_code == 200
+
+    response = client.post("/check-token", json={"token": user_token})
+    assert response.json() == {"role": "user", "is_approved": True}